@@ -1,13 +1,13 @@
 """
 API v1 版本的依赖注入
 """
-from typing import Optional
+from functools import lru_cache
+from typing import Annotated, Optional
 
 from fastapi import Header, HTTPException, status, Depends
 
 from services.user_service import UserService, user_service
 from services.item_service import ItemService, item_service
-from schemas.common import PaginationParams
 
 
 # ============ 认证依赖 ============
@@ -36,27 +36,27 @@ async def require_auth(
     return x_user_id
 
 
-# ============ 分页依赖 ============
+# ============ 条件请求 ============
 
-def get_pagination_params(
-    page: int = 1,
-    page_size: int = 20
-) -> PaginationParams:
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
     """
-    通用分页参数
+    判断 If-None-Match 请求头是否命中当前 ETag
+    支持逗号分隔的多个值和通配符 *，弱比较忽略 W/ 前缀
     """
-    if page < 1:
-        page = 1
-    if page_size < 1:
-        page_size = 20
-    if page_size > 100:
-        page_size = 100
-    
-    return PaginationParams(page=page, page_size=page_size)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
 
 
 # ============ Service 依赖 ============
 
+@lru_cache(maxsize=1)
 def get_user_service() -> UserService:
     """
     获取用户服务实例
@@ -65,8 +65,17 @@ def get_user_service() -> UserService:
     return user_service
 
 
+@lru_cache(maxsize=1)
 def get_item_service() -> ItemService:
     """
     获取物品服务实例
     """
     return item_service
+
+
+# 预绑定的 Service 依赖类型，端点中直接用作参数注解
+UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+ItemServiceDep = Annotated[ItemService, Depends(get_item_service)]
+
+# If-None-Match 请求头
+IfNoneMatch = Annotated[Optional[str], Header(description="缓存校验 ETag")]
@@ -1,39 +1,114 @@
 """
 健康检查端点
 """
-from fastapi import APIRouter
+import asyncio
+import json
 from datetime import datetime
+from typing import Dict
+
+from fastapi import APIRouter, Response
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
+# 健康检查响应体刷新间隔（秒）
+HEALTH_REFRESH_INTERVAL = 1.0
+
+# 依赖服务探测间隔（秒）
+READINESS_PROBE_INTERVAL = 5.0
+
+# 预序列化的健康检查响应体，由后台任务定时刷新
+_health_body: bytes = b""
+
+
+def refresh_health_body() -> None:
+    """
+    重新生成健康检查响应体
+    """
+    global _health_body
+    _health_body = json.dumps(
+        {
+            "status": "healthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "service": "ai-backend"
+        },
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+async def run_health_refresher() -> None:
+    """
+    后台任务：定时刷新预序列化的响应体
+    在应用 lifespan 中启动，关闭时取消
+    """
+    while True:
+        refresh_health_body()
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+
+
+# 导入时先生成一次，保证后台任务启动前也能正常响应
+refresh_health_body()
+
+
+def _render_ready_body(checks: Dict[str, bool]) -> bytes:
+    """
+    将依赖检查结果序列化为就绪检查响应体
+    """
+    return json.dumps(
+        {
+            "ready": bool(checks) and all(checks.values()),
+            "checks": checks,
+            "timestamp": datetime.utcnow().isoformat()
+        },
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+# 预序列化的就绪检查响应体，首次探测完成前为未就绪
+_ready_body: bytes = _render_ready_body({})
+
+
+async def check_dependencies() -> Dict[str, bool]:
+    """
+    探测依赖服务是否可用
+    """
+    # TODO: 检查数据库连接、Redis连接等
+    return {
+        "database": True,
+        "cache": True,
+    }
+
+
+async def refresh_ready_body() -> None:
+    """
+    执行一次依赖探测并更新就绪检查响应体
+    """
+    global _ready_body
+    _ready_body = _render_ready_body(await check_dependencies())
+
+
+async def run_readiness_prober() -> None:
+    """
+    后台任务：定时探测依赖服务，避免就绪检查请求直接打到数据库等依赖
+    启动前需先 await refresh_ready_body() 完成首次探测
+    """
+    while True:
+        await asyncio.sleep(READINESS_PROBE_INTERVAL)
+        await refresh_ready_body()
+
 
 @router.get("")
 async def health_check():
     """
     服务健康检查
+    直接返回预序列化的响应体，跳过响应模型校验和 JSON 编码
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "ai-backend"
-    }
+    return Response(content=_health_body, media_type="application/json")
 
 
 @router.get("/ready")
 async def readiness_check():
     """
     就绪检查 - 检查所有依赖服务是否可用
+    返回后台探测任务最近一次的结果，请求本身不触发依赖检查
     """
-    # TODO: 检查数据库连接、Redis连接等
-    checks = {
-        "database": True,
-        "cache": True,
-    }
-    
-    all_ready = all(checks.values())
-    
-    return {
-        "ready": all_ready,
-        "checks": checks,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return Response(content=_ready_body, media_type="application/json")
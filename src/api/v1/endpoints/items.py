@@ -3,100 +3,118 @@
 """
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import TypeAdapter
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import JSONResponse
 
 from api.v1.deps import (
-    get_pagination_params,
     get_current_user_id,
-    get_item_service,
+    ItemServiceDep,
+    IfNoneMatch,
+    etag_matches,
 )
-from services.item_service import ItemService
 from schemas.item import ItemCreate, ItemUpdate, ItemResponse, ItemStatus, ItemCategory
-from schemas.common import PaginatedResponse, PaginationParams
+from schemas.common import PaginatedResponse
 
 router = APIRouter(prefix="/items", tags=["Items"])
 
+# 分页结果整体序列化为 JSON bytes，一次完成，绕过逐对象编码
+_ITEM_PAGE_ADAPTER = TypeAdapter(PaginatedResponse[ItemResponse])
+
+
+def _not_found(item_id: int) -> JSONResponse:
+    """未命中时直接返回 404 响应，省去抛出 HTTPException；每次新建，避免响应对象在请求间共享"""
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"detail": f"Item with id {item_id} not found"}
+    )
+
 
 @router.get("", response_model=PaginatedResponse[ItemResponse])
 async def get_items(
-    pagination: PaginationParams = Depends(get_pagination_params),
+    service: ItemServiceDep,
+    page: int = Query(1, ge=1, description="页码"),
+    page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     category: Optional[ItemCategory] = Query(None, description="按分类筛选"),
     status: Optional[ItemStatus] = Query(None, description="按状态筛选"),
-    search: Optional[str] = Query(None, description="搜索关键词"),
-    service: ItemService = Depends(get_item_service)
+    search: Optional[str] = Query(None, description="搜索关键词")
 ):
     """
     获取物品列表，支持筛选和搜索
     """
-    return await service.get_items(
-        page=pagination.page,
-        page_size=pagination.page_size,
+    result = service.get_items(
+        page=page,
+        page_size=page_size,
         category=category,
         status=status,
         search=search
     )
+    return Response(
+        content=_ITEM_PAGE_ADAPTER.dump_json(result),
+        media_type="application/json"
+    )
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def get_item(
     item_id: int,
-    service: ItemService = Depends(get_item_service)
+    service: ItemServiceDep,
+    if_none_match: IfNoneMatch = None
 ):
     """
     根据ID获取单个物品
+    If-None-Match 命中当前 ETag 时返回 304，不再序列化响应体
+    数据来自内部存储，直接序列化，跳过响应模型的二次校验
     """
-    item = await service.get_item(item_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Item with id {item_id} not found"
-        )
-    return item
+    etag = service.get_item_etag(item_id)
+    if etag is None:
+        return _not_found(item_id)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(
+        content=service.get_item(item_id).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 @router.post("", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_item(
     item_in: ItemCreate,
-    user_id: Optional[str] = Depends(get_current_user_id),
-    service: ItemService = Depends(get_item_service)
+    service: ItemServiceDep,
+    user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """
     创建新物品
     """
     owner_id = int(user_id) if user_id else None
-    return await service.create_item(item_in, owner_id=owner_id)
+    return service.create_item(item_in, owner_id=owner_id)
 
 
 @router.put("/{item_id}", response_model=ItemResponse)
 async def update_item(
     item_id: int,
     item_in: ItemUpdate,
-    service: ItemService = Depends(get_item_service)
+    service: ItemServiceDep
 ):
     """
     更新物品信息
     """
-    item = await service.update_item(item_id, item_in)
+    item = service.update_item(item_id, item_in)
     if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Item with id {item_id} not found"
-        )
+        return _not_found(item_id)
     return item
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_item(
     item_id: int,
-    service: ItemService = Depends(get_item_service)
+    service: ItemServiceDep
 ):
     """
     删除物品
     """
-    deleted = await service.delete_item(item_id)
+    deleted = service.delete_item(item_id)
     if not deleted:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Item with id {item_id} not found"
-        )
+        return _not_found(item_id)
     return None
@@ -1,61 +1,85 @@
 """
 用户相关端点
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
 
 from api.v1.deps import (
     require_auth, 
-    get_pagination_params,
-    get_user_service,
+    UserServiceDep,
+    IfNoneMatch,
+    etag_matches,
 )
-from services.user_service import UserService
 from schemas.user import UserCreate, UserUpdate, UserResponse
-from schemas.common import PaginatedResponse, PaginationParams
+from schemas.common import PaginatedResponse
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# 分页结果整体序列化为 JSON bytes，一次完成，绕过逐对象编码
+_USER_PAGE_ADAPTER = TypeAdapter(PaginatedResponse[UserResponse])
+
+
+def _not_found(user_id: int) -> JSONResponse:
+    """未命中时直接返回 404 响应，省去抛出 HTTPException；每次新建，避免响应对象在请求间共享"""
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"detail": f"User with id {user_id} not found"}
+    )
+
 
 @router.get("", response_model=PaginatedResponse[UserResponse])
 async def get_users(
-    pagination: PaginationParams = Depends(get_pagination_params),
-    service: UserService = Depends(get_user_service)
+    service: UserServiceDep,
+    page: int = Query(1, ge=1, description="页码"),
+    page_size: int = Query(20, ge=1, le=100, description="每页数量")
 ):
     """
     获取用户列表
     """
-    return await service.get_users(
-        page=pagination.page,
-        page_size=pagination.page_size
+    result = service.get_users(
+        page=page,
+        page_size=page_size
+    )
+    return Response(
+        content=_USER_PAGE_ADAPTER.dump_json(result),
+        media_type="application/json"
     )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    service: UserService = Depends(get_user_service)
+    service: UserServiceDep,
+    if_none_match: IfNoneMatch = None
 ):
     """
     根据ID获取单个用户
+    If-None-Match 命中当前 ETag 时返回 304，不再序列化响应体
+    数据来自内部存储，直接序列化，跳过响应模型的二次校验
     """
-    user = await service.get_user(user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with id {user_id} not found"
-        )
-    return user
+    etag = service.get_user_etag(user_id)
+    if etag is None:
+        return _not_found(user_id)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(
+        content=service.get_user(user_id).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_in: UserCreate,
-    service: UserService = Depends(get_user_service)
+    service: UserServiceDep
 ):
     """
     创建新用户
     """
     try:
-        return await service.create_user(user_in)
+        return service.create_user(user_in)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -67,19 +91,16 @@ async def create_user(
 async def update_user(
     user_id: int,
     user_in: UserUpdate,
-    current_user_id: str = Depends(require_auth),
-    service: UserService = Depends(get_user_service)
+    service: UserServiceDep,
+    current_user_id: str = Depends(require_auth)
 ):
     """
     更新用户信息（需要登录）
     """
     try:
-        user = await service.update_user(user_id, user_in)
+        user = service.update_user(user_id, user_in)
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {user_id} not found"
-            )
+            return _not_found(user_id)
         return user
     except ValueError as e:
         raise HTTPException(
@@ -91,16 +112,13 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
-    current_user_id: str = Depends(require_auth),
-    service: UserService = Depends(get_user_service)
+    service: UserServiceDep,
+    current_user_id: str = Depends(require_auth)
 ):
     """
     删除用户（需要登录）
     """
-    deleted = await service.delete_user(user_id)
+    deleted = service.delete_user(user_id)
     if not deleted:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with id {user_id} not found"
-        )
+        return _not_found(user_id)
     return None
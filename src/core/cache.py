@@ -0,0 +1,46 @@
+"""
+进程内 TTL + LRU 缓存
+用于短时间内重复的只读查询，写操作后由调用方 clear()
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    带过期时间的 LRU 缓存
+    超过 maxsize 时淘汰最久未使用的条目，读取时惰性剔除过期条目
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 2.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (过期时间, 值)
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """获取未过期的缓存值，不存在或已过期时返回 default"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存值并刷新过期时间"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,11 +1,37 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 from fastapi import FastAPI
 
+try:
+    # orjson 为可选依赖，未安装时退回标准 JSONResponse
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
 from utils.log import (
     create_default_log_service,
 )
 from api.v1.router import api_router
+from api.v1.endpoints import health
+
+
+# 应用日志：记录只入队，由 QueueListener 后台线程写 stdout，避免阻塞事件循环
+_log_queue: SimpleQueue = SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+_log_listener = QueueListener(_log_queue, _stream_handler)
+
+logger = logging.getLogger("app")
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
 
 
 @asynccontextmanager
@@ -15,22 +41,39 @@ async def lifespan(app: FastAPI):
     启动时执行初始化，关闭时执行清理
     """
     # ===== 启动时执行 =====
+    _log_listener.start()
+    
     # log服务初始化
     log_service = create_default_log_service()
     results = log_service.init(force=True)
-    print(f"LOG服务初始化结果: {results}")
+    logger.info("LOG服务初始化结果: %s", results)
+    
+    # 健康检查响应体定时刷新
+    health_task = asyncio.create_task(health.run_health_refresher())
+    
+    # 首次依赖探测完成后再开始定时探测
+    await health.refresh_ready_body()
+    readiness_task = asyncio.create_task(health.run_readiness_prober())
     
     yield
     
     # ===== 关闭时执行 =====
-    print("服务正在关闭...")
+    logger.info("服务正在关闭...")
+    for task in (health_task, readiness_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # 写完异步队列中剩余的日志
+    await asyncio.to_thread(log_service.close)
+    _log_listener.stop()
 
 
 app = FastAPI(
     title="AI Backend",
     description="AI 后端服务 API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
 # 注册 API 路由
@@ -2,8 +2,9 @@
 Repository 基类
 提供通用的 CRUD 操作抽象
 """
-from typing import TypeVar, Generic, Optional, List, Dict, Any
+from typing import TypeVar, Generic, Optional, List, Dict, Any, Callable, Iterator
 from abc import ABC, abstractmethod
+from itertools import islice
 
 T = TypeVar("T")  # 模型类型
 CreateSchema = TypeVar("CreateSchema")  # 创建 schema
@@ -17,12 +18,12 @@ class BaseRepository(ABC, Generic[T, CreateSchema, UpdateSchema]):
     """
     
     @abstractmethod
-    async def get(self, id: int) -> Optional[T]:
+    def get(self, id: int) -> Optional[T]:
         """根据 ID 获取单条记录"""
         pass
     
     @abstractmethod
-    async def get_multi(
+    def get_multi(
         self, 
         offset: int = 0, 
         limit: int = 20,
@@ -32,22 +33,22 @@ class BaseRepository(ABC, Generic[T, CreateSchema, UpdateSchema]):
         pass
     
     @abstractmethod
-    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """统计记录数"""
         pass
     
     @abstractmethod
-    async def create(self, obj_in: CreateSchema) -> T:
+    def create(self, obj_in: CreateSchema) -> T:
         """创建记录"""
         pass
     
     @abstractmethod
-    async def update(self, id: int, obj_in: UpdateSchema) -> Optional[T]:
+    def update(self, id: int, obj_in: UpdateSchema) -> Optional[T]:
         """更新记录"""
         pass
     
     @abstractmethod
-    async def delete(self, id: int) -> bool:
+    def delete(self, id: int) -> bool:
         """删除记录"""
         pass
 
@@ -59,95 +60,98 @@ class InMemoryRepository(BaseRepository[T, CreateSchema, UpdateSchema]):
     """
     
     def __init__(self, initial_data: Optional[List[Dict[str, Any]]] = None):
-        self._data: List[Dict[str, Any]] = initial_data or []
-        self._id_counter = len(self._data) + 1
+        # 以 ID 为键的主索引，dict 保持插入顺序，可直接用于分页
+        self._by_id: Dict[int, Dict[str, Any]] = {
+            item["id"]: item for item in (initial_data or [])
+        }
+        self._id_counter = len(self._by_id) + 1
+        # 每条记录的版本号，更新时递增，用于生成 ETag
+        self._versions: Dict[int, int] = dict.fromkeys(self._by_id, 1)
     
-    async def get(self, id: int) -> Optional[Dict[str, Any]]:
+    def get(self, id: int) -> Optional[Dict[str, Any]]:
         """根据 ID 获取单条记录"""
-        for item in self._data:
-            if item.get("id") == id:
-                return item
-        return None
+        return self._by_id.get(id)
+    
+    def get_version(self, id: int) -> Optional[int]:
+        """获取记录当前版本号，记录不存在时返回 None"""
+        return self._versions.get(id)
     
-    async def get_multi(
+    def get_multi(
         self, 
         offset: int = 0, 
         limit: int = 20,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """获取多条记录，支持过滤"""
-        result = self._data
-        
-        # 应用过滤条件
-        if filters:
-            for key, value in filters.items():
-                if value is not None:
-                    result = [
-                        item for item in result 
-                        if item.get(key) == value
-                    ]
-        
-        return result[offset:offset + limit]
+        rows = self._iter_filtered(filters) if filters else self._by_id.values()
+        return list(islice(rows, offset, offset + limit))
     
-    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """统计记录数"""
         if not filters:
-            return len(self._data)
-        
-        result = self._data
-        for key, value in filters.items():
-            if value is not None:
-                result = [
-                    item for item in result 
-                    if item.get(key) == value
-                ]
-        return len(result)
+            return len(self._by_id)
+        return sum(1 for _ in self._iter_filtered(filters))
     
-    async def create(self, obj_in: Dict[str, Any]) -> Dict[str, Any]:
+    def _iter_filtered(self, filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """逐条产出满足全部过滤条件的记录"""
+        conditions = [(key, value) for key, value in filters.items() if value is not None]
+        for item in self._by_id.values():
+            if all(item.get(key) == value for key, value in conditions):
+                yield item
+    
+    def create(self, obj_in: Dict[str, Any]) -> Dict[str, Any]:
         """创建记录"""
         new_item = {
             "id": self._id_counter,
             **obj_in
         }
-        self._data.append(new_item)
+        self._by_id[new_item["id"]] = new_item
+        self._versions[new_item["id"]] = 1
         self._id_counter += 1
         return new_item
     
-    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """更新记录"""
-        for item in self._data:
-            if item.get("id") == id:
-                for key, value in obj_in.items():
-                    if value is not None:
-                        item[key] = value
-                return item
-        return None
-    
-    async def delete(self, id: int) -> bool:
+        item = self._by_id.get(id)
+        if item is None:
+            return None
+        for key, value in obj_in.items():
+            if value is not None:
+                item[key] = value
+        self._versions[id] += 1
+        return item
+    
+    def delete(self, id: int) -> bool:
         """删除记录"""
-        for i, item in enumerate(self._data):
-            if item.get("id") == id:
-                self._data.pop(i)
-                return True
-        return False
+        self._versions.pop(id, None)
+        return self._by_id.pop(id, None) is not None
     
-    async def search(
-        self, 
-        keyword: str, 
+    def _iter_matches(
+        self,
+        keyword: str,
         fields: List[str],
-        offset: int = 0,
-        limit: int = 20
-    ) -> List[Dict[str, Any]]:
-        """搜索记录"""
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """逐条产出命中关键词且满足 predicate 的记录"""
         keyword_lower = keyword.lower()
-        result = []
         
-        for item in self._data:
+        for item in self._by_id.values():
+            if predicate is not None and not predicate(item):
+                continue
             for field in fields:
                 value = item.get(field)
                 if value and keyword_lower in str(value).lower():
-                    result.append(item)
+                    yield item
                     break
-        
-        return result[offset:offset + limit]
-
+    
+    def search(
+        self, 
+        keyword: str, 
+        fields: List[str],
+        offset: int = 0,
+        limit: int = 20,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """搜索记录，收集满 offset + limit 条后立即停止扫描"""
+        matches = self._iter_matches(keyword, fields, predicate)
+        return list(islice(matches, offset, offset + limit))
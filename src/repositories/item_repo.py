@@ -1,7 +1,8 @@
 """
 物品 Repository
 """
-from typing import Optional, List, Dict, Any
+from itertools import islice
+from typing import Optional, List, Dict, Set, Tuple, Any
 
 from repositories.base import InMemoryRepository
 
@@ -13,42 +14,166 @@ INITIAL_ITEMS = [
     {"id": 3, "name": "T-Shirt", "description": "Cotton t-shirt", "price": 29.99, "category": "clothing", "status": "active", "owner_id": 2},
 ]
 
+# 参与关键词搜索的字段
+SEARCH_FIELDS = ("name", "description")
+
+
+def _trigrams(text: str) -> Set[str]:
+    """拆分出文本中所有长度为 3 的子串"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 
 class ItemRepository(InMemoryRepository):
     """
     物品数据访问层
+    维护三元组倒排索引和分类/状态索引，搜索时做集合求交而非全表扫描
     """
     
     def __init__(self):
         super().__init__(initial_data=INITIAL_ITEMS.copy())
+        # 搜索字段的小写文本，写入时计算一次，搜索时直接复用
+        self._search_text: Dict[int, Tuple[str, ...]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_status: Dict[str, Set[int]] = {}
+        for item in self._by_id.values():
+            self._index(item)
+    
+    # ==================== 索引维护 ====================
+    
+    @staticmethod
+    def _search_texts(item: Dict[str, Any]) -> Tuple[str, ...]:
+        """物品搜索字段的小写文本"""
+        return tuple(
+            str(value).lower()
+            for value in (item.get(field) for field in SEARCH_FIELDS)
+            if value
+        )
+    
+    def _index(self, item: Dict[str, Any]) -> None:
+        """将物品加入索引"""
+        item_id = item["id"]
+        texts = self._search_texts(item)
+        self._search_text[item_id] = texts
+        for gram in set().union(*map(_trigrams, texts)):
+            self._trigrams.setdefault(gram, set()).add(item_id)
+        self._by_category.setdefault(item.get("category"), set()).add(item_id)
+        self._by_status.setdefault(item.get("status"), set()).add(item_id)
+    
+    def _unindex(self, item: Dict[str, Any]) -> None:
+        """将物品移出索引"""
+        item_id = item["id"]
+        texts = self._search_text.pop(item_id, ())
+        for gram in set().union(*map(_trigrams, texts)):
+            self._discard(self._trigrams, gram, item_id)
+        self._discard(self._by_category, item.get("category"), item_id)
+        self._discard(self._by_status, item.get("status"), item_id)
+    
+    @staticmethod
+    def _discard(index: Dict[Any, Set[int]], key: Any, item_id: int) -> None:
+        """从索引中移除 ID，空集合一并清理"""
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(item_id)
+        if not ids:
+            del index[key]
     
-    async def get_by_owner(
+    def create(self, obj_in: Dict[str, Any]) -> Dict[str, Any]:
+        """创建物品（同步维护索引）"""
+        item = super().create(obj_in)
+        self._index(item)
+        return item
+    
+    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """更新物品（同步维护索引）"""
+        item = self._by_id.get(id)
+        if item is None:
+            return None
+        self._unindex(item)
+        updated = super().update(id, obj_in)
+        self._index(updated)
+        return updated
+    
+    def delete(self, id: int) -> bool:
+        """删除物品（同步维护索引）"""
+        item = self._by_id.get(id)
+        if item is None:
+            return False
+        self._unindex(item)
+        return super().delete(id)
+    
+    def _match_ids(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[int]:
+        """
+        计算命中的物品 ID（按插入顺序）
+        分类/状态/关键词条件统一在集合求交中完成
+        """
+        candidates: Optional[Set[int]] = None
+        
+        if category:
+            candidates = self._by_category.get(category, set())
+        if status:
+            ids = self._by_status.get(status, set())
+            candidates = ids if candidates is None else candidates & ids
+        
+        if keyword:
+            keyword_lower = keyword.lower()
+            grams = _trigrams(keyword_lower)
+            if grams:
+                postings = sorted(
+                    (self._trigrams.get(gram, set()) for gram in grams),
+                    key=len
+                )
+                hits = postings[0].intersection(*postings[1:])
+                candidates = hits if candidates is None else candidates & hits
+            
+            # 三元组只做粗筛（短关键词无法粗筛），仍需确认子串命中
+            pool = self._by_id.keys() if candidates is None else candidates
+            search_text = self._search_text
+            candidates = {
+                item_id for item_id in pool
+                if any(keyword_lower in text for text in search_text[item_id])
+            }
+        
+        if candidates is None:
+            return list(self._by_id)
+        # ID 单调递增，排序即插入顺序
+        return sorted(candidates)
+    
+    # ==================== 查询 ====================
+    
+    def get_by_owner(
         self, 
         owner_id: int,
         offset: int = 0,
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """获取某用户的物品"""
-        return await self.get_multi(
+        return self.get_multi(
             offset=offset,
             limit=limit,
             filters={"owner_id": owner_id}
         )
     
-    async def get_by_category(
+    def get_by_category(
         self,
         category: str,
         offset: int = 0,
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """按分类获取物品"""
-        return await self.get_multi(
+        return self.get_multi(
             offset=offset,
             limit=limit,
             filters={"category": category}
         )
     
-    async def search_items(
+    def search_items(
         self,
         keyword: str,
         category: Optional[str] = None,
@@ -57,47 +182,42 @@ class ItemRepository(InMemoryRepository):
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """搜索物品"""
-        # 先搜索
-        results = await self.search(
-            keyword=keyword,
-            fields=["name", "description"],
-            offset=0,
-            limit=1000  # 先获取全部再过滤
-        )
+        ids = self._match_ids(keyword, category, status)
+        return [self._by_id[item_id] for item_id in ids[offset:offset + limit]]
+    
+    def search_and_count(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        一次匹配同时返回分页结果和总数
         
-        # 再过滤
-        if category:
-            results = [i for i in results if i.get("category") == category]
-        if status:
-            results = [i for i in results if i.get("status") == status]
+        Returns:
+            (当前页物品列表, 命中总数)
+        """
+        if not (keyword or category or status):
+            page = list(islice(self._by_id.values(), offset, offset + limit))
+            return page, len(self._by_id)
         
-        return results[offset:offset + limit]
+        ids = self._match_ids(keyword, category, status)
+        page = [self._by_id[item_id] for item_id in ids[offset:offset + limit]]
+        return page, len(ids)
     
-    async def count_by_filters(
+    def count_by_filters(
         self,
         category: Optional[str] = None,
         status: Optional[str] = None,
         search: Optional[str] = None
     ) -> int:
         """按条件统计数量"""
-        if search:
-            results = await self.search(
-                keyword=search,
-                fields=["name", "description"],
-                offset=0,
-                limit=10000
-            )
-        else:
-            results = self._data
-        
-        if category:
-            results = [i for i in results if i.get("category") == category]
-        if status:
-            results = [i for i in results if i.get("status") == status]
-        
-        return len(results)
+        if not (category or status or search):
+            return len(self._by_id)
+        return len(self._match_ids(search, category, status))
 
 
 # 单例实例
 item_repository = ItemRepository()
-
@@ -22,22 +22,31 @@ class UserRepository(InMemoryRepository):
     
     def __init__(self):
         super().__init__(initial_data=INITIAL_USERS.copy())
+        # 用户名/邮箱二级索引
+        self._by_username: Dict[str, Dict[str, Any]] = {}
+        self._by_email: Dict[str, Dict[str, Any]] = {}
+        for user in self._by_id.values():
+            self._index(user)
     
-    async def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+    def _index(self, user: Dict[str, Any]) -> None:
+        """将用户加入二级索引"""
+        self._by_username[user["username"]] = user
+        self._by_email[user["email"]] = user
+    
+    def _unindex(self, user: Dict[str, Any]) -> None:
+        """将用户移出二级索引"""
+        self._by_username.pop(user["username"], None)
+        self._by_email.pop(user["email"], None)
+    
+    def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """根据用户名获取用户"""
-        for user in self._data:
-            if user.get("username") == username:
-                return user
-        return None
+        return self._by_username.get(username)
     
-    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """根据邮箱获取用户"""
-        for user in self._data:
-            if user.get("email") == email:
-                return user
-        return None
+        return self._by_email.get(email)
     
-    async def create(self, obj_in: Dict[str, Any]) -> Dict[str, Any]:
+    def create(self, obj_in: Dict[str, Any]) -> Dict[str, Any]:
         """创建用户（添加默认字段）"""
         user_data = {
             **obj_in,
@@ -46,15 +55,35 @@ class UserRepository(InMemoryRepository):
         }
         # 移除明文密码
         user_data.pop("password", None)
-        return await super().create(user_data)
+        user = super().create(user_data)
+        self._index(user)
+        return user
+    
+    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """更新用户（同步维护二级索引）"""
+        user = self._by_id.get(id)
+        if user is None:
+            return None
+        self._unindex(user)
+        updated = super().update(id, obj_in)
+        self._index(updated)
+        return updated
+    
+    def delete(self, id: int) -> bool:
+        """删除用户（同步维护二级索引）"""
+        user = self._by_id.get(id)
+        if user is None:
+            return False
+        self._unindex(user)
+        return super().delete(id)
     
-    async def get_active_users(
+    def get_active_users(
         self, 
         offset: int = 0, 
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """获取活跃用户"""
-        return await self.get_multi(
+        return self.get_multi(
             offset=offset,
             limit=limit,
             filters={"is_active": True}
@@ -2,7 +2,7 @@
 物品相关 Schema
 """
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
@@ -49,6 +49,5 @@ class ItemResponse(ItemBase):
     status: ItemStatus = ItemStatus.ACTIVE
     owner_id: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
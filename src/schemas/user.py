@@ -2,7 +2,7 @@
 用户相关 Schema
 """
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserBase(BaseModel):
@@ -28,6 +28,5 @@ class UserResponse(UserBase):
     id: int
     is_active: bool = True
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
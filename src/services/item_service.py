@@ -2,12 +2,28 @@
 物品 Service
 业务逻辑层
 """
-from typing import Optional
+from typing import Optional, Dict, Any
 
+from core.cache import TTLCache
 from repositories.item_repo import ItemRepository, item_repository
 from schemas.item import ItemCreate, ItemUpdate, ItemResponse, ItemStatus, ItemCategory
 from schemas.common import PaginatedResponse
 
+# 新建物品的默认状态值
+_ACTIVE_STATUS = ItemStatus.ACTIVE.value
+
+
+def _to_response(item: Dict[str, Any]) -> ItemResponse:
+    """
+    仓储数据转换为响应模型
+    数据来自内部存储，无需校验，仅将枚举字段还原为枚举成员
+    """
+    return ItemResponse.model_construct(**{
+        **item,
+        "category": ItemCategory(item["category"]),
+        "status": ItemStatus(item["status"]),
+    })
+
 
 class ItemService:
     """
@@ -16,17 +32,29 @@ class ItemService:
     
     def __init__(self, repo: ItemRepository = None):
         self.repo = repo or item_repository
+        # 列表查询结果缓存，按查询参数作键，任何写操作后清空
+        # 键中不含用户身份，列表结果对所有调用方相同
+        self._list_cache = TTLCache(maxsize=256, ttl=2.0)
     
-    async def get_item(self, item_id: int) -> Optional[ItemResponse]:
+    def get_item(self, item_id: int) -> Optional[ItemResponse]:
         """
         获取单个物品
         """
-        item = await self.repo.get(item_id)
+        item = self.repo.get(item_id)
         if not item:
             return None
-        return ItemResponse(**item)
+        return _to_response(item)
     
-    async def get_items(
+    def get_item_etag(self, item_id: int) -> Optional[str]:
+        """
+        获取物品的 ETag，由 ID 和版本号组成，物品不存在时返回 None
+        """
+        version = self.repo.get_version(item_id)
+        if version is None:
+            return None
+        return f'W/"{item_id}-{version}"'
+    
+    def get_items(
         self,
         page: int = 1,
         page_size: int = 20,
@@ -37,45 +65,32 @@ class ItemService:
         """
         获取物品列表（支持筛选和搜索）
         """
-        offset = (page - 1) * page_size
+        key = (page, page_size, category, status, search)
+        cached = self._list_cache.get(key)
+        if cached is not None:
+            return cached
         
-        # 构建过滤条件
-        filters = {}
-        if category:
-            filters["category"] = category.value
-        if status:
-            filters["status"] = status.value
+        offset = (page - 1) * page_size
         
-        # 搜索或普通查询
-        if search:
-            items = await self.repo.search_items(
-                keyword=search,
-                category=category.value if category else None,
-                status=status.value if status else None,
-                offset=offset,
-                limit=page_size
-            )
-            total = await self.repo.count_by_filters(
-                category=category.value if category else None,
-                status=status.value if status else None,
-                search=search
-            )
-        else:
-            items = await self.repo.get_multi(
-                offset=offset, 
-                limit=page_size,
-                filters=filters if filters else None
-            )
-            total = await self.repo.count(filters=filters if filters else None)
+        # 筛选和搜索在一次匹配中完成，同时得到当前页和总数
+        items, total = self.repo.search_and_count(
+            keyword=search,
+            category=category.value if category else None,
+            status=status.value if status else None,
+            offset=offset,
+            limit=page_size
+        )
         
-        return PaginatedResponse(
-            items=[ItemResponse(**i) for i in items],
+        result = PaginatedResponse(
+            items=[_to_response(i) for i in items],
             total=total,
             page=page,
             page_size=page_size
         )
+        self._list_cache.set(key, result)
+        return result
     
-    async def create_item(
+    def create_item(
         self, 
         item_in: ItemCreate,
         owner_id: Optional[int] = None
@@ -85,13 +100,14 @@ class ItemService:
         """
         item_data = item_in.model_dump()
         item_data["category"] = item_in.category.value
-        item_data["status"] = ItemStatus.ACTIVE.value
+        item_data["status"] = _ACTIVE_STATUS
         item_data["owner_id"] = owner_id
         
-        new_item = await self.repo.create(item_data)
-        return ItemResponse(**new_item)
+        new_item = self.repo.create(item_data)
+        self._list_cache.clear()
+        return _to_response(new_item)
     
-    async def update_item(
+    def update_item(
         self, 
         item_id: int, 
         item_in: ItemUpdate
@@ -99,7 +115,7 @@ class ItemService:
         """
         更新物品
         """
-        existing = await self.repo.get(item_id)
+        existing = self.repo.get(item_id)
         if not existing:
             return None
         
@@ -109,16 +125,20 @@ class ItemService:
                 # 枚举类型转换为字符串
                 update_data[key] = value.value if hasattr(value, 'value') else value
         
-        updated = await self.repo.update(item_id, update_data)
-        return ItemResponse(**updated) if updated else None
+        updated = self.repo.update(item_id, update_data)
+        self._list_cache.clear()
+        return _to_response(updated) if updated else None
     
-    async def delete_item(self, item_id: int) -> bool:
+    def delete_item(self, item_id: int) -> bool:
         """
         删除物品
         """
-        return await self.repo.delete(item_id)
+        deleted = self.repo.delete(item_id)
+        if deleted:
+            self._list_cache.clear()
+        return deleted
     
-    async def get_user_items(
+    def get_user_items(
         self,
         owner_id: int,
         page: int = 1,
@@ -129,15 +149,15 @@ class ItemService:
         """
         offset = (page - 1) * page_size
         
-        items = await self.repo.get_by_owner(
+        items = self.repo.get_by_owner(
             owner_id=owner_id,
             offset=offset,
             limit=page_size
         )
-        total = await self.repo.count(filters={"owner_id": owner_id})
+        total = self.repo.count(filters={"owner_id": owner_id})
         
         return PaginatedResponse(
-            items=[ItemResponse(**i) for i in items],
+            items=[_to_response(i) for i in items],
             total=total,
             page=page,
             page_size=page_size
@@ -4,6 +4,7 @@
 """
 from typing import Optional, List, Dict, Any
 
+from core.cache import TTLCache
 from repositories.user_repo import UserRepository, user_repository
 from schemas.user import UserCreate, UserUpdate, UserResponse
 from schemas.common import PaginatedResponse
@@ -16,17 +17,28 @@ class UserService:
     
     def __init__(self, repo: UserRepository = None):
         self.repo = repo or user_repository
+        # 列表查询结果缓存，按分页参数作键，任何写操作后清空
+        self._list_cache = TTLCache(maxsize=256, ttl=2.0)
     
-    async def get_user(self, user_id: int) -> Optional[UserResponse]:
+    def get_user(self, user_id: int) -> Optional[UserResponse]:
         """
         获取单个用户
         """
-        user = await self.repo.get(user_id)
+        user = self.repo.get(user_id)
         if not user:
             return None
-        return UserResponse(**user)
+        return UserResponse.model_construct(**user)
     
-    async def get_users(
+    def get_user_etag(self, user_id: int) -> Optional[str]:
+        """
+        获取用户的 ETag，由 ID 和版本号组成，用户不存在时返回 None
+        """
+        version = self.repo.get_version(user_id)
+        if version is None:
+            return None
+        return f'W/"{user_id}-{version}"'
+    
+    def get_users(
         self, 
         page: int = 1, 
         page_size: int = 20
@@ -34,40 +46,48 @@ class UserService:
         """
         获取用户列表（分页）
         """
+        key = (page, page_size)
+        cached = self._list_cache.get(key)
+        if cached is not None:
+            return cached
+        
         offset = (page - 1) * page_size
         
-        users = await self.repo.get_multi(offset=offset, limit=page_size)
-        total = await self.repo.count()
+        users = self.repo.get_multi(offset=offset, limit=page_size)
+        total = self.repo.count()
         
-        return PaginatedResponse(
-            items=[UserResponse(**u) for u in users],
+        result = PaginatedResponse(
+            items=[UserResponse.model_construct(**u) for u in users],
             total=total,
             page=page,
             page_size=page_size
         )
+        self._list_cache.set(key, result)
+        return result
     
-    async def create_user(self, user_in: UserCreate) -> UserResponse:
+    def create_user(self, user_in: UserCreate) -> UserResponse:
         """
         创建用户
         包含业务逻辑：检查用户名/邮箱是否重复
         """
         # 检查用户名是否已存在
-        existing = await self.repo.get_by_username(user_in.username)
+        existing = self.repo.get_by_username(user_in.username)
         if existing:
             raise ValueError(f"Username '{user_in.username}' already exists")
         
         # 检查邮箱是否已存在
-        existing = await self.repo.get_by_email(user_in.email)
+        existing = self.repo.get_by_email(user_in.email)
         if existing:
             raise ValueError(f"Email '{user_in.email}' already exists")
         
         # 创建用户
         user_data = user_in.model_dump()
-        new_user = await self.repo.create(user_data)
+        new_user = self.repo.create(user_data)
+        self._list_cache.clear()
         
-        return UserResponse(**new_user)
+        return UserResponse.model_construct(**new_user)
     
-    async def update_user(
+    def update_user(
         self, 
         user_id: int, 
         user_in: UserUpdate
@@ -76,27 +96,31 @@ class UserService:
         更新用户信息
         """
         # 检查用户是否存在
-        existing = await self.repo.get(user_id)
+        existing = self.repo.get(user_id)
         if not existing:
             return None
         
         # 如果更新邮箱，检查是否重复
         if user_in.email:
-            email_user = await self.repo.get_by_email(user_in.email)
+            email_user = self.repo.get_by_email(user_in.email)
             if email_user and email_user.get("id") != user_id:
                 raise ValueError(f"Email '{user_in.email}' already exists")
         
         # 更新
         update_data = user_in.model_dump(exclude_unset=True)
-        updated = await self.repo.update(user_id, update_data)
+        updated = self.repo.update(user_id, update_data)
+        self._list_cache.clear()
         
-        return UserResponse(**updated) if updated else None
+        return UserResponse.model_construct(**updated) if updated else None
     
-    async def delete_user(self, user_id: int) -> bool:
+    def delete_user(self, user_id: int) -> bool:
         """
         删除用户
         """
-        return await self.repo.delete(user_id)
+        deleted = self.repo.delete(user_id)
+        if deleted:
+            self._list_cache.clear()
+        return deleted
 
 
 # 单例服务实例
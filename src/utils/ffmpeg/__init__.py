@@ -6,6 +6,7 @@ FFmpeg 工具模块
 - 比较视频参数
 - 视频拼接（不重编码/重编码）
 - 视频混音（添加背景音乐）
+- 视频抽帧（多个时间点一次完成）
 
 使用示例：
     from utils.ffmpeg import create_ffmpeg_service
@@ -46,7 +47,7 @@ FFmpeg 工具模块
 """
 
 # 配置
-from .configs.config import FFmpegConfig, default_config
+from .configs.config import FFmpegConfig, get_default_config
 
 # 模型
 from .models.models import (
@@ -55,6 +56,8 @@ from .models.models import (
     VideoCompareResult,
     ConcatResult,
     MixAudioResult,
+    ExtractFramesResult,
+    ScanLibraryResult,
 )
 
 # 客户端
@@ -67,10 +70,12 @@ from .services.service import (
     get_default_service,
     create_ffmpeg_service,
 )
+from .services.pool import FFmpegPool
 
 __all__ = [
     # 配置
     "FFmpegConfig",
+    "get_default_config",
     "default_config",
     # 模型
     "ConcatMode",
@@ -78,6 +83,8 @@ __all__ = [
     "VideoCompareResult",
     "ConcatResult",
     "MixAudioResult",
+    "ExtractFramesResult",
+    "ScanLibraryResult",
     # 客户端
     "FFmpegError",
     "FFmpegClient",
@@ -86,6 +93,14 @@ __all__ = [
     "FFmpegService",
     "get_default_service",
     "create_ffmpeg_service",
+    "FFmpegPool",
 ]
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name: str):
+    # default_config 懒加载，导入包时不查找可执行文件（PEP 562）
+    if name == "default_config":
+        return get_default_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,18 @@
 """
 FFmpeg 配置模块
 """
-from .config import FFmpegConfig, default_config
+from .config import FFmpegConfig, get_default_config
 
 __all__ = [
     "FFmpegConfig",
+    "get_default_config",
     "default_config",
 ]
 
+
+def __getattr__(name: str):
+    # default_config 懒加载，见 config.get_default_config
+    if name == "default_config":
+        return get_default_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
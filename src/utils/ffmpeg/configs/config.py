@@ -4,6 +4,7 @@ FFmpeg 配置
 import os
 import tempfile
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 import shutil
 
@@ -13,6 +14,18 @@ ENV_FFMPEG_PATH = "FFMPEG_PATH"
 ENV_FFPROBE_PATH = "FFPROBE_PATH"
 ENV_FFMPEG_TEMP_DIR = "FFMPEG_TEMP_DIR"
 
+# 硬件编码可选值
+HWACCEL_OPTIONS = ("none", "auto", "nvenc", "qsv", "vaapi")
+
+
+@lru_cache(maxsize=None)
+def resolve_executable(name: str) -> Optional[str]:
+    """
+    在 PATH 中查找可执行文件的完整路径
+    结果在进程内缓存，避免每次创建配置都遍历 PATH
+    """
+    return shutil.which(name)
+
 
 def _get_default_ffmpeg_path() -> str:
     """
@@ -38,9 +51,12 @@ def _get_default_temp_dir() -> Optional[str]:
     return os.environ.get(ENV_FFMPEG_TEMP_DIR)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FFmpegConfig:
-    """FFmpeg 配置类"""
+    """
+    FFmpeg 配置类
+    创建后不可修改，可作为字典键或在多个服务间共享
+    """
     
     # FFmpeg 可执行文件路径
     # 优先级：显式指定 > 环境变量 > PATH 查找 > 默认值
@@ -63,29 +79,74 @@ class FFmpegConfig:
     # 日志级别: quiet, panic, fatal, error, warning, info, verbose, debug
     log_level: str = "error"
     
+    # 视频信息缓存条数，按 (路径, 大小, 修改时间) 缓存 ffprobe 结果，0 表示不缓存
+    probe_cache_size: int = 1024
+    
+    # ffprobe 读取的最大字节数（-probesize）和分析时长（-analyzeduration，微秒）
+    # 0 表示使用 ffprobe 默认值；mp4/mkv 的流参数在文件头中，可调小以减少读盘
+    probe_size: int = 0
+    analyze_duration: int = 0
+    
+    # 每个 ffmpeg 编码任务的线程数（-threads），0 表示由 ffmpeg 自行决定
+    threads_per_job: int = 0
+    
+    # FFmpegPool 最大并发任务数，0 表示按 CPU 核数 / threads_per_job 自动计算
+    max_concurrency: int = 0
+    
+    # 硬件编码：none（软件编码）, auto（自动检测）, nvenc, qsv, vaapi
+    # 启用后对 libx264/libx265 使用对应的硬件编码器，不可用时回退到软件编码
+    hwaccel: str = "none"
+    
+    # VAAPI 设备路径，为空时使用 /dev/dri/renderD128
+    hwaccel_device: Optional[str] = None
+    
+    # 任务结果缓存目录，为空时不缓存
+    # 输入文件和参数完全相同的拼接/混音任务直接复用上次的输出，不再运行 ffmpeg
+    result_cache_dir: Optional[str] = None
+    
     def __post_init__(self):
         """初始化后验证"""
         self._resolve_ffmpeg_paths()
         self._validate_temp_dir()
+        self._validate_hwaccel()
     
     def _resolve_ffmpeg_paths(self):
-        """解析 ffmpeg/ffprobe 路径"""
+        """
+        解析 ffmpeg/ffprobe 路径
+        配置不可变，解析结果通过 object.__setattr__ 写入
+        """
         # 如果是默认值（非绝对路径），尝试从 PATH 查找完整路径
-        if self.ffmpeg_path and not os.path.isabs(self.ffmpeg_path):
-            found = shutil.which(self.ffmpeg_path)
-            if found:
-                self.ffmpeg_path = found
-        
-        if self.ffprobe_path and not os.path.isabs(self.ffprobe_path):
-            found = shutil.which(self.ffprobe_path)
-            if found:
-                self.ffprobe_path = found
+        for name in ("ffmpeg_path", "ffprobe_path"):
+            path = getattr(self, name)
+            if path and not os.path.isabs(path):
+                found = resolve_executable(path)
+                if found:
+                    object.__setattr__(self, name, found)
     
     def _validate_temp_dir(self):
         """验证并创建临时目录"""
         if self.temp_dir:
             os.makedirs(self.temp_dir, exist_ok=True)
     
+    def _validate_hwaccel(self):
+        """验证硬件编码配置"""
+        if self.hwaccel not in HWACCEL_OPTIONS:
+            raise ValueError(
+                f"不支持的 hwaccel: {self.hwaccel}，可选值: {', '.join(HWACCEL_OPTIONS)}"
+            )
+    
+    def get_max_concurrency(self) -> int:
+        """
+        获取并发任务数
+        未显式指定时使 并发数 × 每任务线程数 ≈ CPU 核数
+        """
+        if self.max_concurrency > 0:
+            return self.max_concurrency
+        cpu_count = os.cpu_count() or 1
+        if self.threads_per_job > 0:
+            return max(1, cpu_count // self.threads_per_job)
+        return cpu_count
+    
     def get_temp_dir(self) -> str:
         """
         获取临时目录路径
@@ -94,5 +155,17 @@ class FFmpegConfig:
         return self.temp_dir or tempfile.gettempdir()
 
 
-# 默认配置
-default_config = FFmpegConfig()
+@lru_cache(maxsize=1)
+def get_default_config() -> FFmpegConfig:
+    """
+    获取默认配置（懒加载）
+    首次调用时才查找可执行文件，导入模块时不做任何文件系统操作
+    """
+    return FFmpegConfig()
+
+
+def __getattr__(name: str):
+    # 兼容旧的 default_config 模块属性，首次访问时才创建（PEP 562）
+    if name == "default_config":
+        return get_default_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
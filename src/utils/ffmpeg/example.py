@@ -8,6 +8,7 @@ from utils.ffmpeg import (
     FFmpegService,
     FFmpegClient,
     FFmpegClientConfig,
+    FFmpegPool,
     ConcatMode,
 )
 
@@ -173,7 +174,7 @@ def example_auto_concat():
         fps=30
     )
     
-    print(f"使用模式: {result.mode.value}")
+    print(f"使用模式: {result.mode.label}")
     print(f"成功: {result.success}")
 
 
@@ -187,7 +188,7 @@ def example_check_compatibility():
     compat = service.check_compatibility(videos)
     
     print(f"所有视频兼容: {compat['compatible']}")
-    print(f"推荐模式: {compat['recommended_mode'].value}")
+    print(f"推荐模式: {compat['recommended_mode'].label}")
     
     if compat['all_differences']:
         print("发现的差异:")
@@ -257,5 +258,28 @@ def example_mix_audio_no_loop():
         print(f"混音成功! 音频未循环: {not result.audio_looped}")
 
 
+def example_pool():
+    """并发执行多个任务示例"""
+    
+    # 每个任务 2 个编码线程，并发数自动取 CPU 核数 / 2
+    config = FFmpegConfig(threads_per_job=2)
+    service = create_ffmpeg_service(config)
+    
+    videos = ["video1.mp4", "video2.mp4", "video3.mp4"]
+    
+    with FFmpegPool(config) as pool:
+        results = pool.map([
+            lambda v=v: service.mix_audio(
+                video_path=v,
+                audio_path="bgm.mp3",
+                output_path=f"bgm_{v}"
+            )
+            for v in videos
+        ])
+    
+    for video, result in zip(videos, results):
+        print(f"{video}: {'成功' if result.success else result.error_message}")
+
+
 if __name__ == "__main__":
     example_quick_start()
@@ -7,6 +7,8 @@ from .models import (
     VideoCompareResult,
     ConcatResult,
     MixAudioResult,
+    ExtractFramesResult,
+    ScanLibraryResult,
 )
 
 __all__ = [
@@ -15,5 +17,7 @@ __all__ = [
     "VideoCompareResult",
     "ConcatResult",
     "MixAudioResult",
+    "ExtractFramesResult",
+    "ScanLibraryResult",
 ]
 
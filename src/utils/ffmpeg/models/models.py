@@ -2,17 +2,25 @@
 FFmpeg 数据模型
 """
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from enum import Enum
 
 
 class ConcatMode(str, Enum):
-    """视频拼接模式"""
+    """
+    视频拼接模式
+    成员是单例，内部判断用 is 比较，避免 str 混入带来的逐字符比较
+    """
     COPY = "copy"          # 不重新编码，使用 concat demuxer
     REENCODE = "reencode"  # 重新编码，使用 filter_complex
+    
+    @property
+    def label(self) -> str:
+        """对外展示用的模式名称"""
+        return self._value_
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoInfo:
     """视频信息"""
     # 基本信息
@@ -54,7 +62,7 @@ class VideoInfo:
         return self.audio_codec is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoCompareResult:
     """视频比较结果"""
     is_compatible: bool = False  # 是否兼容（可以不重新编码拼接）
@@ -74,7 +82,7 @@ class VideoCompareResult:
         return self.is_compatible
 
 
-@dataclass
+@dataclass(slots=True)
 class ConcatResult:
     """视频拼接结果"""
     success: bool = False
@@ -92,7 +100,25 @@ class ConcatResult:
     execution_time: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
+class ExtractFramesResult:
+    """视频抽帧结果"""
+    success: bool = False
+    
+    # 输出图片路径，按帧顺序排列；换算到同一帧的时间点只有一张图片
+    output_paths: List[str] = field(default_factory=list)
+    
+    # 时间点 -> 图片路径，超出视频长度而未抽到的时间点不在其中
+    frame_paths: Dict[float, str] = field(default_factory=dict)
+    
+    # 错误信息
+    error_message: Optional[str] = None
+    
+    # 执行时间（秒）
+    execution_time: float = 0.0
+
+
+@dataclass(slots=True)
 class MixAudioResult:
     """视频混音结果"""
     success: bool = False
@@ -111,3 +137,12 @@ class MixAudioResult:
     # 执行时间（秒）
     execution_time: float = 0.0
 
+
+@dataclass(slots=True)
+class ScanLibraryResult:
+    """视频库扫描结果"""
+    # 可不重新编码拼接的分组，组与组内顺序均为首次出现顺序
+    groups: List[List[str]] = field(default_factory=list)
+    
+    # 无法读取的文件（路径 -> 错误信息），不参与分组
+    failed: Dict[str, str] = field(default_factory=dict)
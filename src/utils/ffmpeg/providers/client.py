@@ -3,23 +3,217 @@ FFmpeg 命令行客户端
 封装 subprocess 调用
 """
 import subprocess
+import errno
+import hashlib
 import json
 import os
+import shutil
 import tempfile
+import threading
 import time
-import shutil
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# 优先使用 orjson 解析 ffprobe 输出，可直接解析 bytes；未安装时回退到标准库
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需区分
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from .exceptions import FFmpegError
+from ..configs.config import resolve_executable
 from ..models.models import (
     VideoInfo,
     VideoCompareResult,
     ConcatResult,
     ConcatMode,
     MixAudioResult,
+    ExtractFramesResult,
+)
+
+
+# 错误信息中保留的 stderr 末尾行数
+STDERR_TAIL_LINES = 200
+
+# ffprobe 只输出解析时用到的字段，省去 tags/disposition/side_data 等内容
+PROBE_FORMAT_ENTRIES = "format=duration,size,bit_rate,format_name"
+PROBE_STREAM_ENTRIES = (
+    "stream=codec_type,codec_name,bit_rate,width,height,pix_fmt,r_frame_rate,sample_rate,channels"
 )
 
+# concat demuxer 从 stdin 读取文件列表，不再写临时列表文件
+# 列表中均为绝对路径，需要 -safe 0；pipe 协议需显式加入白名单
+CONCAT_LIST_INPUT_ARGS = [
+    "-f", "concat",
+    "-safe", "0",
+    "-protocol_whitelist", "file,pipe",
+    "-i", "pipe:0",
+]
+
+# 运行 ffmpeg 前对每个输入预读的字节数
+# 只预读开头部分：覆盖容器头和首批数据，又不会因大文件挤占页缓存
+PREFETCH_BYTES = 8 << 20
+
+# ffmpeg -version 结果的缓存时间（秒）
+VERSION_CACHE_TTL = 60.0
+
+# ffmpeg 路径 -> (过期时间, 版本信息)
+_version_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+_version_cache_lock = threading.Lock()
+
+# 背景音乐不超过该时长（秒）时用 aloop 滤镜循环，解码后的 PCM 常驻内存
+# 60 秒 48kHz 立体声约 23MB；更长的音乐仍用 -stream_loop 重复解码
+AUDIO_LOOP_BUFFER_SECONDS = 60.0
+
+# aloop 缓冲的最大采样数，足以容纳整段短音乐
+AUDIO_LOOP_MAX_SAMPLES = 2147483647
+
+# 子进程启动参数
+# subprocess 只有在 close_fds=False 时才会走 posix_spawn（vfork 语义），否则回退到 fork+exec，
+# 父进程内存越大 fork 越慢。Python 创建的文件描述符默认不可继承（PEP 446），
+# 关闭 close_fds 不会把无关的 fd 泄漏给 ffmpeg
+_SPAWN_KWARGS = {"close_fds": False}
+
+# 硬件编码类型，按 auto 模式下的尝试顺序排列
+HWACCEL_TYPES = ("nvenc", "qsv", "vaapi")
+
+# 软件编码器对应的编码格式，用于拼出硬件编码器名称（如 h264_nvenc）
+_HW_CODEC_FAMILIES = {
+    "libx264": "h264",
+    "h264": "h264",
+    "libx265": "hevc",
+    "hevc": "hevc",
+}
+
+# VAAPI 默认设备
+DEFAULT_VAAPI_DEVICE = "/dev/dri/renderD128"
+
+
+@lru_cache(maxsize=None)
+def _hw_encoder_works(ffmpeg_path: str, encoder: str, vaapi_device: Optional[str]) -> bool:
+    """
+    用一帧测试编码验证硬件编码器是否可用
+    编码器编译进 ffmpeg 不代表机器上有对应硬件，只看 -encoders 列表并不可靠；
+    结果在进程内缓存，每种编码器只检测一次
+    """
+    cmd = [ffmpeg_path, "-hide_banner", "-loglevel", "error"]
+    if vaapi_device:
+        cmd.extend(["-vaapi_device", vaapi_device])
+    cmd.extend(["-f", "lavfi", "-i", "color=size=256x256:duration=0.1"])
+    if vaapi_device:
+        cmd.extend(["-vf", "format=nv12,hwupload"])
+    cmd.extend(["-frames:v", "1", "-c:v", encoder, "-f", "null", "-"])
+    
+    try:
+        completed = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=10,
+            **_SPAWN_KWARGS
+        )
+        return completed.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _to_int(value: Union[int, str, None]) -> int:
+    """
+    将 ffprobe 输出的数值字段转为 int
+    字段缺失或为 "N/A" 等非数字内容时返回 0，不走异常分支
+    """
+    if not value:
+        return 0
+    if isinstance(value, int):
+        return value
+    return int(value) if value.isdigit() else 0
+
+
+def _parse_fps(value: str) -> float:
+    """
+    解析 r_frame_rate（如 "30000/1001"、"25"、"0/0"）
+    partition 不创建列表；先按整数解析分子分母，再做一次除法
+    """
+    num, sep, den = value.partition("/")
+    if not sep:
+        return float(num) if num else 0.0
+    d = _to_int(den)
+    return _to_int(num) / d if d else 0.0
+
+
+@lru_cache(maxsize=64)
+def _build_concat_filter(
+    n: int,
+    resolution: Optional[str],
+    fps: Optional[float],
+    hwupload: bool
+) -> Tuple[str, str]:
+    """
+    构建重新编码拼接使用的 filter_complex
+    只与输入个数和输出参数有关，相同规格的任务直接复用缓存结果
+    
+    Returns:
+        (filter_complex, 视频输出标签)
+    """
+    # 每个输入使用相同的视频滤镜链，只构建一次
+    video_filters = []
+    if resolution:
+        w, h = resolution.split("x")
+        video_filters.append(
+            f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2"
+        )
+    if fps:
+        video_filters.append(f"fps={fps}")
+    video_chain = ",".join(video_filters) or "null"
+    
+    filter_parts = [
+        f"[{i}:v]{video_chain}[v{i}];[{i}:a]anull[a{i}]"
+        for i in range(n)
+    ]
+    
+    concat_inputs = "".join(f"[v{i}][a{i}]" for i in range(n))
+    filter_parts.append(f"{concat_inputs}concat=n={n}:v=1:a=1[outv][outa]")
+    
+    video_output = "[outv]"
+    if hwupload:
+        # VAAPI 编码器只接受显存中的帧，滤镜处理完成后再上传
+        filter_parts.append("[outv]format=nv12,hwupload[outvhw]")
+        video_output = "[outvhw]"
+    
+    return ";".join(filter_parts), video_output
+
+
+def _copy_file(src_path: str, dst_path: str):
+    """
+    复制文件内容，优先使用 os.copy_file_range
+    数据在内核中复制，不经过用户态；XFS/Btrfs 等文件系统上会直接创建 reflink
+    内核或文件系统不支持时回退到 shutil.copyfile
+    """
+    with open(src_path, "rb") as fsrc, open(dst_path, "wb") as fdst:
+        if hasattr(os, "copy_file_range"):
+            remaining = os.fstat(fsrc.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError as e:
+                # 旧内核不支持跨文件系统复制（EXDEV），部分文件系统不支持该调用
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst)
+
 
 @dataclass
 class FFmpegClientConfig:
@@ -44,6 +238,21 @@ class FFmpegClientConfig:
     # 日志级别
     log_level: str = "error"
     
+    # 视频信息缓存条数，0 表示不缓存
+    probe_cache_size: int = 1024
+    probe_size: int = 0         # ffprobe -probesize，0 表示默认值
+    analyze_duration: int = 0   # ffprobe -analyzeduration（微秒），0 表示默认值
+    
+    # 每个 ffmpeg 任务的编码线程数，0 表示由 ffmpeg 自行决定
+    threads_per_job: int = 0
+    
+    # 硬件编码：none, auto, nvenc, qsv, vaapi
+    hwaccel: str = "none"
+    
+    # VAAPI 设备路径，为空时使用 /dev/dri/renderD128
+    hwaccel_device: Optional[str] = None
+    result_cache_dir: Optional[str] = None  # 任务结果缓存目录，为空时不缓存
+    
     def __post_init__(self):
         """初始化后解析路径"""
         self._resolve_paths()
@@ -51,12 +260,12 @@ class FFmpegClientConfig:
     def _resolve_paths(self):
         """解析 ffmpeg 路径"""
         if self.ffmpeg_path == "ffmpeg":
-            found = shutil.which("ffmpeg")
+            found = resolve_executable("ffmpeg")
             if found:
                 self.ffmpeg_path = found
         
         if self.ffprobe_path == "ffprobe":
-            found = shutil.which("ffprobe")
+            found = resolve_executable("ffprobe")
             if found:
                 self.ffprobe_path = found
     
@@ -73,20 +282,55 @@ class FFmpegClient:
     
     def __init__(self, config: Optional[FFmpegClientConfig] = None):
         self.config = config or FFmpegClientConfig()
+        
+        # 视频信息缓存：(绝对路径, 文件大小, 修改时间) -> VideoInfo
+        # 文件被修改后 stat 变化，旧缓存自然不再命中
+        self._info_cache: "OrderedDict[Tuple[str, int, int], VideoInfo]" = OrderedDict()
+        self._info_cache_lock = threading.Lock()
+        
+        # 固定的命令前缀在创建时构建一次，每次调用只拼接可变参数
+        # 创建后修改 config 中的路径或日志级别不会生效，应重新创建 client
+        self._ffmpeg_base = (self.config.ffmpeg_path, "-y", "-loglevel", self.config.log_level)
+        self._ffmpeg_pipe_base = (self.config.ffmpeg_path, "-loglevel", self.config.log_level)
+        self._threads_args = (
+            ("-threads", str(self.config.threads_per_job))
+            if self.config.threads_per_job > 0 else ()
+        )
+        probe_limits = ()
+        if self.config.probe_size > 0:
+            probe_limits += ("-probesize", str(self.config.probe_size))
+        if self.config.analyze_duration > 0:
+            probe_limits += ("-analyzeduration", str(self.config.analyze_duration))
+        self._probe_format_base = (
+            self.config.ffprobe_path, "-v", "quiet", *probe_limits, "-print_format", "json",
+            "-show_entries", PROBE_FORMAT_ENTRIES
+        )
+        self._probe_streams_base = (
+            self.config.ffprobe_path, "-v", "quiet", *probe_limits, "-print_format", "json",
+            "-show_entries", f"{PROBE_FORMAT_ENTRIES}:{PROBE_STREAM_ENTRIES}"
+        )
     
     # ==================== 基础命令执行 ====================
     
     def _run_command(
         self, 
         cmd: List[str], 
-        timeout: Optional[int] = None
-    ) -> Tuple[int, str, str]:
+        timeout: Optional[int] = None,
+        capture_stdout: bool = True,
+        raw_stdout: bool = False,
+        stdin_data: Optional[bytes] = None
+    ) -> Tuple[int, Union[str, bytes], str]:
         """
         执行命令并返回结果
+        stderr 由后台线程持续读取，只保留最后 STDERR_TAIL_LINES 行，
+        长时间运行时内存占用恒定，也不会因管道写满而阻塞子进程
         
         Args:
             cmd: 命令列表
             timeout: 超时时间（秒）
+            capture_stdout: 是否读取 stdout，为 False 时直接丢弃
+            raw_stdout: 是否以 bytes 返回 stdout，跳过解码
+            stdin_data: 写入子进程 stdin 的数据，为 None 时不连接 stdin
         
         Returns:
             (return_code, stdout, stderr)
@@ -96,59 +340,401 @@ class FFmpegClient:
         try:
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
+                stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
+                **_SPAWN_KWARGS
             )
-            stdout, stderr = process.communicate(timeout=timeout)
-            return process.returncode, stdout, stderr
-            
+        except FileNotFoundError:
+            raise FFmpegError(f"找不到可执行文件: {cmd[0]}")
+        except Exception as e:
+            raise FFmpegError(f"命令执行失败: {e}")
+        
+        stderr_tail: deque = deque(maxlen=STDERR_TAIL_LINES)
+        readers = [threading.Thread(target=stderr_tail.extend, args=(process.stderr,), daemon=True)]
+        stdout_parts: List[bytes] = []
+        if capture_stdout:
+            readers.append(threading.Thread(
+                target=lambda: stdout_parts.append(process.stdout.read()),
+                daemon=True
+            ))
+        if stdin_data is not None:
+            readers.append(self._stdin_writer(process, stdin_data))
+        for reader in readers:
+            reader.start()
+        
+        try:
+            returncode = process.wait(timeout=timeout)
         except subprocess.TimeoutExpired:
             process.kill()
+            process.wait()
             raise FFmpegError(f"命令执行超时: {' '.join(cmd[:3])}...")
+        finally:
+            for reader in readers:
+                reader.join()
+            process.stderr.close()
+            if capture_stdout:
+                process.stdout.close()
+        
+        stdout = b"".join(stdout_parts)
+        if not raw_stdout:
+            stdout = stdout.decode("utf-8", errors="replace")
+        stderr = b"".join(stderr_tail).decode("utf-8", errors="replace")
+        return returncode, stdout, stderr
+    
+    @staticmethod
+    def _stdin_writer(process: subprocess.Popen, data: bytes) -> threading.Thread:
+        """
+        创建向子进程 stdin 写入数据的线程，写完后关闭 stdin
+        数据超过管道缓冲区时写入会阻塞，因此不能在主线程中直接写
+        """
+        def write():
+            try:
+                process.stdin.write(data)
+            except (BrokenPipeError, ValueError):
+                # 子进程提前退出或已被终止，失败原因由返回码和 stderr 体现
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+        
+        return threading.Thread(target=write, daemon=True)
+    
+    def _build_ffmpeg_cmd(self, args: List[str]) -> List[str]:
+        """构建完整的 ffmpeg 命令"""
+        # -threads 作为输出选项，放在输出文件之前
+        return [*self._ffmpeg_base, *args[:-1], *self._threads_args, args[-1]]
+    
+    def _run_ffmpeg(
+        self,
+        args: List[str],
+        timeout: Optional[int] = None,
+        stdin_data: Optional[bytes] = None,
+        cache_inputs: Optional[List[str]] = None
+    ) -> Tuple[int, str, str]:
+        """
+        执行 ffmpeg 命令，输出写入文件，不读取 stdout
+        
+        Args:
+            cache_inputs: 输入文件列表，配置了 result_cache_dir 时用于计算结果缓存键；
+                命中缓存时直接复制缓存的输出，不运行 ffmpeg
+        """
+        cmd = self._build_ffmpeg_cmd(args)
+        output_path = args[-1]
+        
+        cache_path = None
+        if self.config.result_cache_dir and cache_inputs:
+            cache_path = self._result_cache_path(cmd, cache_inputs)
+            if self._restore_cached_result(cache_path, output_path):
+                return 0, "", ""
+        
+        returncode, stdout, stderr = self._run_command(
+            cmd,
+            timeout,
+            capture_stdout=False,
+            stdin_data=stdin_data
+        )
+        
+        if returncode == 0 and cache_path:
+            self._store_cached_result(output_path, cache_path)
+        return returncode, stdout, stderr
+    
+    def _result_cache_path(self, cmd: List[str], input_paths: List[str]) -> str:
+        """
+        计算结果缓存文件路径
+        键由输入文件（绝对路径、大小、修改时间，保持顺序）和除输出路径外的完整命令组成
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for path in input_paths:
+            st = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        digest.update("\0".join(cmd[:-1]).encode())
+        ext = os.path.splitext(cmd[-1])[1]
+        return os.path.join(self.config.result_cache_dir, digest.hexdigest() + ext)
+    
+    @staticmethod
+    def _restore_cached_result(cache_path: str, output_path: str) -> bool:
+        """
+        缓存命中时复制到输出路径
+        使用复制而不是硬链接，之后原地覆盖输出文件不会破坏缓存
+        """
+        if not os.path.isfile(cache_path):
+            return False
+        try:
+            _copy_file(cache_path, output_path)
+        except OSError:
+            return False
+        return True
+    
+    @staticmethod
+    def _store_cached_result(output_path: str, cache_path: str):
+        """将输出写入结果缓存，先写临时文件再 rename；失败时忽略"""
+        cache_dir = os.path.dirname(cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+            os.close(fd)
+        except OSError:
+            return
+        try:
+            _copy_file(output_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+    
+    def _run_pipeline(
+        self,
+        producer_cmd: List[str],
+        consumer_cmd: List[str],
+        timeout: Optional[int] = None,
+        producer_stdin: Optional[bytes] = None
+    ) -> Tuple[int, str]:
+        """
+        执行两段串联的命令，前一个进程的 stdout 直接作为后一个进程的 stdin
+        两个子进程共用同一个内核管道，数据不经过 Python，也不落盘
+        
+        Args:
+            producer_stdin: 写入前一个进程 stdin 的数据
+        
+        Returns:
+            (return_code, stderr)，优先返回后一个进程的失败信息
+        """
+        timeout = timeout or self.config.timeout
+        
+        try:
+            producer = subprocess.Popen(
+                producer_cmd,
+                stdin=subprocess.PIPE if producer_stdin is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **_SPAWN_KWARGS
+            )
         except FileNotFoundError:
-            raise FFmpegError(f"找不到可执行文件: {cmd[0]}")
+            raise FFmpegError(f"找不到可执行文件: {producer_cmd[0]}")
+        except Exception as e:
+            raise FFmpegError(f"命令执行失败: {e}")
+        
+        try:
+            consumer = subprocess.Popen(
+                consumer_cmd,
+                stdin=producer.stdout,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                **_SPAWN_KWARGS
+            )
         except Exception as e:
+            producer.kill()
+            producer.wait()
+            for stream in (producer.stdin, producer.stdout, producer.stderr):
+                if stream:
+                    stream.close()
             raise FFmpegError(f"命令执行失败: {e}")
+        
+        # 父进程关闭自己持有的读端，后一个进程提前退出时前一个进程能收到 SIGPIPE
+        producer.stdout.close()
+        
+        processes = (producer, consumer)
+        stderr_tails = [deque(maxlen=STDERR_TAIL_LINES) for _ in processes]
+        readers = [
+            threading.Thread(target=tail.extend, args=(process.stderr,), daemon=True)
+            for tail, process in zip(stderr_tails, processes)
+        ]
+        if producer_stdin is not None:
+            readers.append(self._stdin_writer(producer, producer_stdin))
+        for reader in readers:
+            reader.start()
+        
+        deadline = time.monotonic() + timeout
+        try:
+            consumer_code = consumer.wait(timeout=timeout)
+            producer_code = producer.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            for process in processes:
+                process.kill()
+                process.wait()
+            raise FFmpegError(f"命令执行超时: {' '.join(consumer_cmd[:3])}...")
+        finally:
+            for reader in readers:
+                reader.join()
+            for process in processes:
+                process.stderr.close()
+        
+        producer_stderr, consumer_stderr = (
+            b"".join(tail).decode("utf-8", errors="replace") for tail in stderr_tails
+        )
+        if consumer_code != 0:
+            return consumer_code, consumer_stderr
+        return producer_code, producer_stderr
     
-    def _run_ffmpeg(self, args: List[str], timeout: Optional[int] = None) -> Tuple[int, str, str]:
-        """执行 ffmpeg 命令"""
-        cmd = [self.config.ffmpeg_path, "-y", "-loglevel", self.config.log_level] + args
-        return self._run_command(cmd, timeout)
+    def _run_ffprobe(self, cmd: List[str]) -> Tuple[int, bytes, str]:
+        """执行 ffprobe 命令，stdout 以 bytes 返回，直接交给 JSON 解析"""
+        return self._run_command(cmd, timeout=60, raw_stdout=True)
     
-    def _run_ffprobe(self, args: List[str]) -> Tuple[int, str, str]:
-        """执行 ffprobe 命令"""
-        cmd = [self.config.ffprobe_path] + args
-        return self._run_command(cmd, timeout=60)
+    def _resolve_video_encoder(self, video_codec: str) -> Tuple[str, Optional[str]]:
+        """
+        按 hwaccel 配置选择视频编码器
+        硬件编码器不可用时回退到原软件编码器
+        
+        Returns:
+            (编码器名称, VAAPI 设备路径，非 VAAPI 时为 None)
+        """
+        family = _HW_CODEC_FAMILIES.get(video_codec)
+        if self.config.hwaccel == "none" or family is None:
+            return video_codec, None
+        
+        if self.config.hwaccel == "auto":
+            candidates = HWACCEL_TYPES
+        else:
+            candidates = (self.config.hwaccel,)
+        
+        for hwaccel in candidates:
+            device = None
+            if hwaccel == "vaapi":
+                device = self.config.hwaccel_device or DEFAULT_VAAPI_DEVICE
+            encoder = f"{family}_{hwaccel}"
+            if _hw_encoder_works(self.config.ffmpeg_path, encoder, device):
+                return encoder, device
+        
+        return video_codec, None
     
     # ==================== 视频信息获取 ====================
     
-    def get_video_info(self, video_path: str) -> VideoInfo:
+    @staticmethod
+    def _stat_or_raise(path: str, kind: str = "视频") -> os.stat_result:
+        """获取文件状态，文件不存在时抛出 FFmpegError"""
+        try:
+            return os.stat(path)
+        except OSError:
+            raise FFmpegError(f"{kind}文件不存在: {path}")
+    
+    @staticmethod
+    def _prefetch(paths: List[str]):
+        """
+        提示内核预读输入文件开头部分（POSIX_FADV_WILLNEED）
+        预读在 ffmpeg 启动期间异步进行，ffmpeg 读取时页缓存已就绪；
+        只是提示，失败或平台不支持时直接忽略
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        for path in dict.fromkeys(paths):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, PREFETCH_BYTES, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+    
+    def _stat_inputs(self, video_paths: List[str]) -> Dict[str, os.stat_result]:
+        """检查输入视频是否存在，每个路径只 stat 一次"""
+        return {path: self._stat_or_raise(path) for path in dict.fromkeys(video_paths)}
+    
+    def get_video_info(self, video_path: str, st: Optional[os.stat_result] = None) -> VideoInfo:
         """
         获取视频详细信息
+        同一文件未修改时直接返回缓存结果，不再启动 ffprobe
+        
+        Args:
+            video_path: 视频文件路径
+            st: 调用方已获取的文件状态，传入时不再重复 stat
         """
-        if not os.path.exists(video_path):
-            raise FFmpegError(f"视频文件不存在: {video_path}")
+        if st is None:
+            st = self._stat_or_raise(video_path)
         
-        args = [
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            "-show_streams",
-            video_path
-        ]
+        cached = self._get_cached_info(video_path, st)
+        if cached is not None:
+            return cached
+        
+        info = self._probe_video_info(video_path)
+        
+        if self.config.probe_cache_size > 0:
+            key = self._info_cache_key(video_path, st)
+            with self._info_cache_lock:
+                self._info_cache[key] = replace(info)
+                if len(self._info_cache) > self.config.probe_cache_size:
+                    self._info_cache.popitem(last=False)
         
-        returncode, stdout, stderr = self._run_ffprobe(args)
+        return info
+    
+    @staticmethod
+    def _info_cache_key(video_path: str, st: os.stat_result) -> Tuple[str, int, int]:
+        """视频信息缓存键：(绝对路径, 文件大小, 修改时间)"""
+        return (os.path.abspath(video_path), st.st_size, st.st_mtime_ns)
+    
+    def _get_cached_info(self, video_path: str, st: os.stat_result) -> Optional[VideoInfo]:
+        """查找缓存的视频信息，未命中时返回 None，不调用 ffprobe"""
+        key = self._info_cache_key(video_path, st)
+        with self._info_cache_lock:
+            cached = self._info_cache.get(key)
+            if cached is None:
+                return None
+            self._info_cache.move_to_end(key)
+        # 返回副本，避免调用方修改影响缓存
+        return replace(cached, path=video_path)
+    
+    def get_video_infos(
+        self,
+        video_paths: List[str],
+        max_workers: Optional[int] = None,
+        stats: Optional[Dict[str, os.stat_result]] = None,
+        errors: Optional[Dict[str, str]] = None
+    ) -> List[VideoInfo]:
+        """
+        批量获取视频信息，按输入顺序返回
+        未命中缓存的文件并发调用 ffprobe
+        
+        Args:
+            video_paths: 视频文件路径列表
+            max_workers: 最大并发数，默认为 CPU 核数
+            stats: 调用方已获取的文件状态（路径 -> stat 结果）
+            errors: 传入时单个文件读取失败不再抛出，记录到该字典（路径 -> 错误信息），
+                返回结果中跳过失败的文件
+        """
+        unique_paths = list(dict.fromkeys(video_paths))
+        stats = stats or {}
+        
+        def get_info(path: str) -> Optional[VideoInfo]:
+            if errors is None:
+                return self.get_video_info(path, stats.get(path))
+            try:
+                return self.get_video_info(path, stats.get(path))
+            except FFmpegError as e:
+                errors[path] = str(e)
+                return None
+        
+        if len(unique_paths) <= 1:
+            infos = {path: get_info(path) for path in unique_paths}
+        else:
+            max_workers = min(len(unique_paths), max_workers or os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                infos = dict(zip(unique_paths, executor.map(get_info, unique_paths)))
+        
+        return [infos[path] for path in video_paths if infos[path] is not None]
+    
+    def clear_info_cache(self):
+        """清空视频信息缓存"""
+        with self._info_cache_lock:
+            self._info_cache.clear()
+    
+    def _probe_video_info(self, video_path: str) -> VideoInfo:
+        """调用 ffprobe 读取视频信息"""
+        returncode, stdout, stderr = self._run_ffprobe([*self._probe_streams_base, video_path])
         
         if returncode != 0:
             raise FFmpegError(f"无法读取视频信息: {stderr}")
         
         try:
-            data = json.loads(stdout)
-        except json.JSONDecodeError:
-            raise FFmpegError(f"无法解析视频信息: {stdout}")
+            data = _json_loads(stdout)
+        except ValueError:
+            raise FFmpegError(f"无法解析视频信息: {stdout.decode('utf-8', errors='replace')}")
         
         format_info = data.get("format", {})
         streams = data.get("streams", [])
@@ -156,8 +742,8 @@ class FFmpegClient:
         info = VideoInfo(
             path=video_path,
             duration=float(format_info.get("duration", 0)),
-            size=int(format_info.get("size", 0)),
-            bitrate=int(format_info.get("bit_rate", 0)),
+            size=_to_int(format_info.get("size")),
+            bitrate=_to_int(format_info.get("bit_rate")),
             format_name=format_info.get("format_name")
         )
         
@@ -166,26 +752,59 @@ class FFmpegClient:
             
             if codec_type == "video":
                 info.video_codec = stream.get("codec_name")
-                info.video_bitrate = int(stream.get("bit_rate", 0) or 0)
-                info.width = int(stream.get("width", 0))
-                info.height = int(stream.get("height", 0))
+                info.video_bitrate = _to_int(stream.get("bit_rate"))
+                info.width = _to_int(stream.get("width"))
+                info.height = _to_int(stream.get("height"))
                 info.pixel_format = stream.get("pix_fmt")
-                
-                fps_str = stream.get("r_frame_rate", "0/1")
-                if "/" in fps_str:
-                    num, den = fps_str.split("/")
-                    info.fps = float(num) / float(den) if float(den) > 0 else 0
-                else:
-                    info.fps = float(fps_str)
+                info.fps = _parse_fps(stream.get("r_frame_rate", "0/1"))
                     
             elif codec_type == "audio":
                 info.audio_codec = stream.get("codec_name")
-                info.audio_bitrate = int(stream.get("bit_rate", 0) or 0)
-                info.sample_rate = int(stream.get("sample_rate", 0) or 0)
-                info.channels = int(stream.get("channels", 0))
+                info.audio_bitrate = _to_int(stream.get("bit_rate"))
+                info.sample_rate = _to_int(stream.get("sample_rate"))
+                info.channels = _to_int(stream.get("channels"))
         
         return info
     
+    def _fill_output_result(
+        self,
+        result: Union[ConcatResult, MixAudioResult],
+        output_path: str,
+        duration: Optional[float] = None
+    ):
+        """
+        填充输出文件信息
+        大小直接取自 stat；已知时长时不再调用 ffprobe，否则只读取格式信息
+        """
+        try:
+            st = os.stat(output_path)
+        except FileNotFoundError:
+            result.error_message = "输出文件未生成"
+            return
+        
+        if duration is None:
+            duration = self._probe_format(output_path, "输出")["duration"]
+        
+        result.success = True
+        result.output_path = output_path
+        result.duration = duration
+        result.size = st.st_size
+    
+    @staticmethod
+    def _expected_bgm_duration(
+        video_duration: float,
+        audio_duration: float,
+        audio_looped: bool,
+        replace_audio: bool
+    ) -> float:
+        """
+        根据输入推算添加背景音乐后的输出时长
+        替换音频时使用了 -shortest，音乐不循环且较短时输出随音乐结束
+        """
+        if replace_audio and not audio_looped and 0 < audio_duration < video_duration:
+            return audio_duration
+        return video_duration
+    
     # ==================== 视频比较 ====================
     
     def compare_videos(
@@ -199,7 +818,37 @@ class FFmpegClient:
         """
         info1 = self.get_video_info(video1_path)
         info2 = self.get_video_info(video2_path)
-        
+        return self.compare_video_infos(info1, info2, fps_tolerance)
+    
+    @staticmethod
+    def video_infos_compatible(
+        info1: VideoInfo,
+        info2: VideoInfo,
+        fps_tolerance: float = 0.1
+    ) -> bool:
+        """
+        判断两个视频信息是否兼容，结果与 compare_video_infos().is_compatible 一致
+        遇到第一个不匹配项即返回，不生成差异描述
+        """
+        return (
+            info1.video_codec == info2.video_codec
+            and info1.width == info2.width
+            and info1.height == info2.height
+            and abs(info1.fps - info2.fps) <= fps_tolerance
+            and info1.audio_codec == info2.audio_codec
+            and info1.sample_rate == info2.sample_rate
+            and info1.channels == info2.channels
+        )
+    
+    def compare_video_infos(
+        self,
+        info1: VideoInfo,
+        info2: VideoInfo,
+        fps_tolerance: float = 0.1
+    ) -> VideoCompareResult:
+        """
+        比较两个已获取的视频信息，不调用 ffprobe
+        """
         result = VideoCompareResult()
         differences = []
         
@@ -260,57 +909,56 @@ class FFmpegClient:
             result.error_message = "至少需要两个视频文件"
             return result
         
-        for path in video_paths:
-            if not os.path.exists(path):
-                result.error_message = f"视频文件不存在: {path}"
-                return result
-        
-        temp_dir = self.config.get_temp_dir()
-        list_file = os.path.join(temp_dir, f"concat_list_{int(time.time())}.txt")
+        try:
+            stats = self._stat_inputs(video_paths)
+        except FFmpegError as e:
+            result.error_message = str(e)
+            return result
         
         try:
-            with open(list_file, 'w', encoding='utf-8') as f:
-                for path in video_paths:
-                    abs_path = os.path.abspath(path).replace("'", "'\\''")
-                    f.write(f"file '{abs_path}'\n")
-            
             output_dir = os.path.dirname(output_path)
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
             
-            args = [
-                "-f", "concat",
-                "-safe", "0",
-                "-i", list_file,
+            args = CONCAT_LIST_INPUT_ARGS + [
                 "-c", "copy",
                 output_path
             ]
             
-            returncode, stdout, stderr = self._run_ffmpeg(args)
+            self._prefetch(video_paths)
+            
+            returncode, stdout, stderr = self._run_ffmpeg(
+                args,
+                stdin_data=self._build_concat_list(video_paths),
+                cache_inputs=video_paths
+            )
             
             if returncode != 0:
                 result.error_message = f"FFmpeg 执行失败: {stderr}"
                 return result
             
-            if os.path.exists(output_path):
-                output_info = self.get_video_info(output_path)
-                result.success = True
-                result.output_path = output_path
-                result.duration = output_info.duration
-                result.size = output_info.size
-            else:
-                result.error_message = "输出文件未生成"
+            # 流复制拼接的时长即各段时长之和，输入信息都已缓存时无需再 probe 输出
+            cached = [self._get_cached_info(path, stats[path]) for path in video_paths]
+            duration = sum(info.duration for info in cached) if all(cached) else None
+            self._fill_output_result(result, output_path, duration)
             
         except Exception as e:
             result.error_message = str(e)
-            
-        finally:
-            if os.path.exists(list_file):
-                os.remove(list_file)
         
         result.execution_time = time.time() - start_time
         return result
     
+    @staticmethod
+    def _build_concat_list(video_paths: List[str]) -> bytes:
+        """生成 concat demuxer 使用的列表内容，通过 stdin 传给 ffmpeg"""
+        # os.path.abspath 每次都会调用 getcwd，这里只取一次
+        cwd = os.getcwd()
+        lines = []
+        for path in video_paths:
+            abs_path = path if os.path.isabs(path) else os.path.normpath(os.path.join(cwd, path))
+            lines.append("file '" + abs_path.replace("'", "'\\''") + "'\n")
+        return "".join(lines).encode("utf-8")
+    
     # ==================== 视频拼接 - 重新编码 ====================
     
     def concat_reencode(
@@ -334,10 +982,11 @@ class FFmpegClient:
             result.error_message = "至少需要两个视频文件"
             return result
         
-        for path in video_paths:
-            if not os.path.exists(path):
-                result.error_message = f"视频文件不存在: {path}"
-                return result
+        try:
+            self._stat_inputs(video_paths)
+        except FFmpegError as e:
+            result.error_message = str(e)
+            return result
         
         video_codec = video_codec or self.config.video_codec
         audio_codec = audio_codec or self.config.audio_codec
@@ -349,42 +998,23 @@ class FFmpegClient:
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
             
+            video_codec, vaapi_device = self._resolve_video_encoder(video_codec)
+            
             n = len(video_paths)
             
             input_args = []
+            if vaapi_device:
+                input_args.extend(["-vaapi_device", vaapi_device])
             for path in video_paths:
                 input_args.extend(["-i", path])
             
-            filter_parts = []
-            
-            for i in range(n):
-                video_filters = []
-                
-                if resolution:
-                    w, h = resolution.split("x")
-                    video_filters.append(
-                        f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
-                        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2"
-                    )
-                
-                if fps:
-                    video_filters.append(f"fps={fps}")
-                
-                if video_filters:
-                    filter_parts.append(f"[{i}:v]{','.join(video_filters)}[v{i}]")
-                else:
-                    filter_parts.append(f"[{i}:v]null[v{i}]")
-                
-                filter_parts.append(f"[{i}:a]anull[a{i}]")
-            
-            concat_inputs = "".join([f"[v{i}][a{i}]" for i in range(n)])
-            filter_parts.append(f"{concat_inputs}concat=n={n}:v=1:a=1[outv][outa]")
-            
-            filter_complex = ";".join(filter_parts)
+            filter_complex, video_output = _build_concat_filter(
+                n, resolution, fps, hwupload=vaapi_device is not None
+            )
             
             args = input_args + [
                 "-filter_complex", filter_complex,
-                "-map", "[outv]",
+                "-map", video_output,
                 "-map", "[outa]",
                 "-c:v", video_codec,
                 "-b:v", video_bitrate,
@@ -393,20 +1023,16 @@ class FFmpegClient:
                 output_path
             ]
             
-            returncode, stdout, stderr = self._run_ffmpeg(args)
+            self._prefetch(video_paths)
+            
+            returncode, stdout, stderr = self._run_ffmpeg(args, cache_inputs=video_paths)
             
             if returncode != 0:
                 result.error_message = f"FFmpeg 执行失败: {stderr}"
                 return result
             
-            if os.path.exists(output_path):
-                output_info = self.get_video_info(output_path)
-                result.success = True
-                result.output_path = output_path
-                result.duration = output_info.duration
-                result.size = output_info.size
-            else:
-                result.error_message = "输出文件未生成"
+            # 重新编码可能使时长略有变化，只 probe 输出的格式信息
+            self._fill_output_result(result, output_path)
             
         except Exception as e:
             result.error_message = str(e)
@@ -448,18 +1074,17 @@ class FFmpegClient:
         start_time = time.time()
         result = MixAudioResult()
         
-        # 验证文件存在
-        if not os.path.exists(video_path):
-            result.error_message = f"视频文件不存在: {video_path}"
-            return result
-        
-        if not os.path.exists(audio_path):
-            result.error_message = f"音频文件不存在: {audio_path}"
+        # 验证文件存在，视频的 stat 结果直接用于信息缓存查找
+        try:
+            video_stat = self._stat_or_raise(video_path)
+            self._stat_or_raise(audio_path, kind="音频")
+        except FFmpegError as e:
+            result.error_message = str(e)
             return result
         
         try:
             # 获取视频时长
-            video_info = self.get_video_info(video_path)
+            video_info = self.get_video_info(video_path, video_stat)
             video_duration = video_info.duration
             
             # 获取音频时长
@@ -475,51 +1100,32 @@ class FFmpegClient:
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
             
-            # 使用配置默认值
-            audio_codec = audio_codec or self.config.audio_codec
-            audio_bitrate = audio_bitrate or self.config.audio_bitrate
-            
-            # 构建 ffmpeg 命令
-            if replace_original or original_volume == 0:
-                # 完全替换原音频
-                args = self._build_replace_audio_args(
-                    video_path=video_path,
-                    audio_path=audio_path,
-                    output_path=output_path,
-                    video_duration=video_duration,
-                    loop_audio=loop_audio and need_loop,
-                    audio_volume=audio_volume,
-                    audio_codec=audio_codec,
-                    audio_bitrate=audio_bitrate
-                )
-            else:
-                # 混合原音频和背景音乐
-                args = self._build_mix_audio_args(
-                    video_path=video_path,
-                    audio_path=audio_path,
-                    output_path=output_path,
-                    video_duration=video_duration,
-                    loop_audio=loop_audio and need_loop,
-                    audio_volume=audio_volume,
-                    original_volume=original_volume,
-                    audio_codec=audio_codec,
-                    audio_bitrate=audio_bitrate
-                )
+            args = self._build_bgm_args(
+                video_path=video_path,
+                audio_path=audio_path,
+                output_path=output_path,
+                video_duration=video_duration,
+                audio_duration=audio_duration,
+                loop_audio=loop_audio and need_loop,
+                replace_original=replace_original,
+                audio_volume=audio_volume,
+                original_volume=original_volume,
+                audio_codec=audio_codec,
+                audio_bitrate=audio_bitrate
+            )
             
-            returncode, stdout, stderr = self._run_ffmpeg(args)
+            self._prefetch([video_path, audio_path])
+            
+            returncode, stdout, stderr = self._run_ffmpeg(args, cache_inputs=[video_path, audio_path])
             
             if returncode != 0:
                 result.error_message = f"FFmpeg 执行失败: {stderr}"
                 return result
             
-            if os.path.exists(output_path):
-                output_info = self.get_video_info(output_path)
-                result.success = True
-                result.output_path = output_path
-                result.duration = output_info.duration
-                result.size = output_info.size
-            else:
-                result.error_message = "输出文件未生成"
+            self._fill_output_result(result, output_path, self._expected_bgm_duration(
+                video_duration, audio_duration, result.audio_looped,
+                replace_original or original_volume == 0
+            ))
             
         except Exception as e:
             result.error_message = str(e)
@@ -527,30 +1133,198 @@ class FFmpegClient:
         result.execution_time = time.time() - start_time
         return result
     
+    def concat_mix_audio(
+        self,
+        video_paths: List[str],
+        audio_path: str,
+        output_path: str,
+        loop_audio: bool = True,
+        replace_original: bool = True,
+        audio_volume: float = 1.0,
+        original_volume: float = 0.0,
+        audio_codec: Optional[str] = None,
+        audio_bitrate: Optional[str] = None
+    ) -> MixAudioResult:
+        """
+        不重新编码拼接视频并添加背景音乐
+        拼接进程以 NUT 格式输出到管道，混音进程直接从管道读取，不生成中间文件
+        
+        Args:
+            video_paths: 视频文件路径列表（参数需一致）
+            audio_path: 音频文件路径
+            其余参数同 mix_audio
+        
+        Returns:
+            MixAudioResult 对象
+        """
+        start_time = time.time()
+        result = MixAudioResult()
+        
+        if len(video_paths) < 2:
+            result.error_message = "至少需要两个视频文件"
+            return result
+        
+        try:
+            video_stats = self._stat_inputs(video_paths)
+            self._stat_or_raise(audio_path, kind="音频")
+        except FFmpegError as e:
+            result.error_message = str(e)
+            return result
+        
+        try:
+            # 拼接后时长为各段之和
+            infos = self.get_video_infos(video_paths, stats=video_stats)
+            video_duration = sum(info.duration for info in infos)
+            audio_duration = self._get_audio_info(audio_path).get("duration", 0)
+            
+            need_loop = audio_duration < video_duration
+            result.audio_looped = need_loop and loop_audio
+            
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
+            producer_cmd = [
+                *self._ffmpeg_pipe_base,
+                *CONCAT_LIST_INPUT_ARGS,
+                "-c", "copy",
+                "-f", "nut",
+                "pipe:1"
+            ]
+            consumer_cmd = self._build_ffmpeg_cmd(self._build_bgm_args(
+                video_path="pipe:0",
+                audio_path=audio_path,
+                output_path=output_path,
+                video_duration=video_duration,
+                audio_duration=audio_duration,
+                loop_audio=loop_audio and need_loop,
+                replace_original=replace_original,
+                audio_volume=audio_volume,
+                original_volume=original_volume,
+                audio_codec=audio_codec,
+                audio_bitrate=audio_bitrate
+            ))
+            
+            self._prefetch(video_paths + [audio_path])
+            
+            returncode, stderr = self._run_pipeline(
+                producer_cmd,
+                consumer_cmd,
+                producer_stdin=self._build_concat_list(video_paths)
+            )
+            
+            if returncode != 0:
+                result.error_message = f"FFmpeg 执行失败: {stderr}"
+                return result
+            
+            self._fill_output_result(result, output_path, self._expected_bgm_duration(
+                video_duration, audio_duration, result.audio_looped,
+                replace_original or original_volume == 0
+            ))
+            
+        except Exception as e:
+            result.error_message = str(e)
+        
+        result.execution_time = time.time() - start_time
+        return result
+    
+    def _build_bgm_args(
+        self,
+        video_path: str,
+        audio_path: str,
+        output_path: str,
+        video_duration: float,
+        audio_duration: float,
+        loop_audio: bool,
+        replace_original: bool,
+        audio_volume: float,
+        original_volume: float,
+        audio_codec: Optional[str],
+        audio_bitrate: Optional[str]
+    ) -> List[str]:
+        """构建添加背景音乐的 ffmpeg 参数"""
+        # 使用配置默认值
+        audio_codec = audio_codec or self.config.audio_codec
+        audio_bitrate = audio_bitrate or self.config.audio_bitrate
+        
+        if replace_original or original_volume == 0:
+            # 完全替换原音频
+            return self._build_replace_audio_args(
+                video_path=video_path,
+                audio_path=audio_path,
+                output_path=output_path,
+                video_duration=video_duration,
+                audio_duration=audio_duration,
+                loop_audio=loop_audio,
+                audio_volume=audio_volume,
+                audio_codec=audio_codec,
+                audio_bitrate=audio_bitrate
+            )
+        
+        # 混合原音频和背景音乐
+        return self._build_mix_audio_args(
+            video_path=video_path,
+            audio_path=audio_path,
+            output_path=output_path,
+            video_duration=video_duration,
+            audio_duration=audio_duration,
+            loop_audio=loop_audio,
+            audio_volume=audio_volume,
+            original_volume=original_volume,
+            audio_codec=audio_codec,
+            audio_bitrate=audio_bitrate
+        )
+    
+    def _build_bgm_input(
+        self,
+        audio_path: str,
+        video_duration: float,
+        audio_duration: float,
+        loop_audio: bool,
+        audio_volume: float
+    ) -> Tuple[List[str], str]:
+        """
+        构建背景音乐的输入参数和音量滤镜（输出标签 [bgm]）
+        较短的音乐用 aloop 在滤镜内循环，只解码一次；
+        较长的音乐解码后占用内存过大，仍用 -stream_loop 重复读取
+        
+        Returns:
+            (输入参数, 滤镜)
+        """
+        if loop_audio and 0 < audio_duration <= AUDIO_LOOP_BUFFER_SECONDS:
+            audio_filter = (
+                f"[1:a]aloop=loop=-1:size={AUDIO_LOOP_MAX_SAMPLES},"
+                f"atrim=duration={video_duration},asetpts=N/SR/TB,"
+                f"volume={audio_volume}[bgm]"
+            )
+            return ["-i", audio_path], audio_filter
+        
+        audio_filter = f"[1:a]volume={audio_volume}[bgm]"
+        if loop_audio:
+            return ["-stream_loop", "-1", "-i", audio_path], audio_filter
+        return ["-i", audio_path], audio_filter
+    
     def _get_audio_info(self, audio_path: str) -> dict:
         """获取音频文件信息"""
-        args = [
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            audio_path
-        ]
-        
-        returncode, stdout, stderr = self._run_ffprobe(args)
+        return self._probe_format(audio_path, "音频")
+    
+    def _probe_format(self, path: str, kind: str) -> dict:
+        """只读取容器格式信息（时长、大小、比特率）"""
+        returncode, stdout, stderr = self._run_ffprobe([*self._probe_format_base, path])
         
         if returncode != 0:
-            raise FFmpegError(f"无法读取音频信息: {stderr}")
+            raise FFmpegError(f"无法读取{kind}信息: {stderr}")
         
         try:
-            data = json.loads(stdout)
+            data = _json_loads(stdout)
             format_info = data.get("format", {})
             return {
                 "duration": float(format_info.get("duration", 0)),
-                "size": int(format_info.get("size", 0)),
-                "bitrate": int(format_info.get("bit_rate", 0)),
+                "size": _to_int(format_info.get("size")),
+                "bitrate": _to_int(format_info.get("bit_rate")),
             }
-        except json.JSONDecodeError:
-            raise FFmpegError(f"无法解析音频信息: {stdout}")
+        except ValueError:
+            raise FFmpegError(f"无法解析{kind}信息: {stdout.decode('utf-8', errors='replace')}")
     
     def _build_replace_audio_args(
         self,
@@ -558,6 +1332,7 @@ class FFmpegClient:
         audio_path: str,
         output_path: str,
         video_duration: float,
+        audio_duration: float,
         loop_audio: bool,
         audio_volume: float,
         audio_codec: str,
@@ -569,14 +1344,11 @@ class FFmpegClient:
         # 输入视频
         args.extend(["-i", video_path])
         
-        # 输入音频（如需循环）
-        if loop_audio:
-            args.extend(["-stream_loop", "-1", "-i", audio_path])
-        else:
-            args.extend(["-i", audio_path])
-        
-        # 构建滤镜
-        audio_filter = f"[1:a]volume={audio_volume}[bgm]"
+        # 输入音频（如需循环）和音量滤镜
+        audio_input, audio_filter = self._build_bgm_input(
+            audio_path, video_duration, audio_duration, loop_audio, audio_volume
+        )
+        args.extend(audio_input)
         
         args.extend([
             "-filter_complex", audio_filter,
@@ -598,6 +1370,7 @@ class FFmpegClient:
         audio_path: str,
         output_path: str,
         video_duration: float,
+        audio_duration: float,
         loop_audio: bool,
         audio_volume: float,
         original_volume: float,
@@ -610,16 +1383,16 @@ class FFmpegClient:
         # 输入视频
         args.extend(["-i", video_path])
         
-        # 输入音频（如需循环）
-        if loop_audio:
-            args.extend(["-stream_loop", "-1", "-i", audio_path])
-        else:
-            args.extend(["-i", audio_path])
+        # 输入音频（如需循环）和音量滤镜
+        audio_input, audio_filter = self._build_bgm_input(
+            audio_path, video_duration, audio_duration, loop_audio, audio_volume
+        )
+        args.extend(audio_input)
         
         # 构建滤镜：调整音量并混合
         filter_complex = (
             f"[0:a]volume={original_volume}[orig];"
-            f"[1:a]volume={audio_volume}[bgm];"
+            f"{audio_filter};"
             f"[orig][bgm]amix=inputs=2:duration=first[aout]"
         )
         
@@ -636,30 +1409,241 @@ class FFmpegClient:
         
         return args
     
+    # ==================== 视频抽帧 ====================
+    
+    def extract_frames(
+        self,
+        video_path: str,
+        timestamps: List[float],
+        output_dir: str,
+        image_format: str = "jpg"
+    ) -> ExtractFramesResult:
+        """
+        按时间点批量抽取视频帧
+        所有时间点合并为一个 select 表达式，只启动一次 ffmpeg 顺序解码，
+        取到最后一帧后即停止；时间点按恒定帧率换算为帧号
+        
+        每次调用在 output_dir 下新建独立子目录写入图片，不会把之前留下的文件当作本次输出。
+        换算到同一帧的时间点只输出一张图片，output_paths 按帧顺序排列、与 timestamps 不一一对应；
+        按时间点查找图片使用 frame_paths。
+        
+        Args:
+            video_path: 视频文件路径
+            timestamps: 时间点列表（秒）
+            output_dir: 图片输出目录
+            image_format: 图片格式（默认 jpg）
+        
+        Returns:
+            ExtractFramesResult 对象
+        """
+        start_time = time.time()
+        result = ExtractFramesResult()
+        
+        if not timestamps:
+            result.error_message = "至少需要一个时间点"
+            return result
+        
+        try:
+            video_info = self.get_video_info(video_path)
+            if video_info.fps <= 0:
+                result.error_message = f"无法获取视频帧率: {video_path}"
+                return result
+            
+            # 去重并排序，同一帧只输出一次
+            frame_numbers = sorted({int(ts * video_info.fps) for ts in timestamps})
+            select_expr = "+".join(f"eq(n,{n})" for n in frame_numbers)
+            
+            os.makedirs(output_dir, exist_ok=True)
+            frames_dir = tempfile.mkdtemp(prefix="frames_", dir=output_dir)
+            pattern = os.path.join(frames_dir, f"frame_%04d.{image_format}")
+            
+            args = [
+                "-i", video_path,
+                "-vf", f"select='{select_expr}'",
+                "-vsync", "0",
+                "-frames:v", str(len(frame_numbers)),
+                pattern
+            ]
+            
+            returncode, stdout, stderr = self._run_ffmpeg(args)
+            
+            if returncode != 0:
+                shutil.rmtree(frames_dir, ignore_errors=True)
+                result.error_message = f"FFmpeg 执行失败: {stderr}"
+                return result
+            
+            # 图片按帧号顺序编号；时间点超出视频长度时 ffmpeg 只写出前面的部分
+            frame_paths: Dict[int, str] = {}
+            for i, frame_number in enumerate(frame_numbers, 1):
+                path = pattern % i
+                if not os.path.exists(path):
+                    break
+                frame_paths[frame_number] = path
+            result.output_paths = list(frame_paths.values())
+            for ts in timestamps:
+                path = frame_paths.get(int(ts * video_info.fps))
+                if path is not None:
+                    result.frame_paths[ts] = path
+            
+            if result.output_paths:
+                result.success = True
+            else:
+                os.rmdir(frames_dir)
+                result.error_message = "输出文件未生成"
+            
+        except Exception as e:
+            result.error_message = str(e)
+        
+        result.execution_time = time.time() - start_time
+        return result
+    
+    def iter_frames(
+        self,
+        video_path: str,
+        fps: Optional[float] = None,
+        scale: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        以 MJPEG 管道流式读取视频帧，每次产出一张 JPEG 图片
+        不写临时文件，消费方处理与 ffmpeg 解码并行进行；
+        生成器提前关闭时终止 ffmpeg 进程
+        
+        Args:
+            video_path: 视频文件路径
+            fps: 输出帧率，为空时输出全部帧
+            scale: 输出分辨率，如 "640x360"
+        
+        Yields:
+            单张 JPEG 图片的 bytes
+        """
+        if not os.path.exists(video_path):
+            raise FFmpegError(f"视频文件不存在: {video_path}")
+        
+        video_filters = []
+        if fps:
+            video_filters.append(f"fps={fps}")
+        if scale:
+            w, h = scale.split("x")
+            video_filters.append(f"scale={w}:{h}")
+        
+        cmd = [*self._ffmpeg_pipe_base, "-i", video_path]
+        if video_filters:
+            cmd.extend(["-vf", ",".join(video_filters)])
+        cmd.extend(["-f", "image2pipe", "-vcodec", "mjpeg", "pipe:1"])
+        
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=1 << 20,
+                **_SPAWN_KWARGS
+            )
+        except FileNotFoundError:
+            raise FFmpegError(f"找不到可执行文件: {cmd[0]}")
+        
+        buffer = bytearray()
+        try:
+            while True:
+                chunk = process.stdout.read1(1 << 16)
+                if not chunk:
+                    break
+                buffer += chunk
+                
+                # 按 JPEG 起止标记 FFD8 / FFD9 切分
+                while True:
+                    start = buffer.find(b"\xff\xd8")
+                    if start < 0:
+                        # 保留可能是半个起始标记的末尾字节
+                        del buffer[:-1]
+                        break
+                    end = buffer.find(b"\xff\xd9", start + 2)
+                    if end < 0:
+                        del buffer[:start]
+                        break
+                    yield bytes(buffer[start:end + 2])
+                    del buffer[:end + 2]
+            
+            if process.wait() != 0:
+                raise FFmpegError(f"FFmpeg 执行失败，返回码: {process.returncode}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+    
     # ==================== 工具方法 ====================
     
+    def move_output(self, src_path: str, dst_path: str) -> str:
+        """
+        将输出文件移动到最终位置
+        同一文件系统内直接 rename；跨文件系统时先在目标目录复制为临时文件，
+        再 rename 到目标路径，其他进程不会读到写了一半的文件
+        
+        Args:
+            src_path: 源文件路径（如 temp_dir 中的 ffmpeg 输出）
+            dst_path: 目标文件路径
+        
+        Returns:
+            目标文件路径
+        """
+        dst_dir = os.path.dirname(dst_path)
+        if dst_dir:
+            os.makedirs(dst_dir, exist_ok=True)
+        
+        try:
+            os.replace(src_path, dst_path)
+            return dst_path
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        
+        # mkstemp 保证并发移动到同一目录时临时文件名不冲突
+        fd, part_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(dst_path)}.",
+            suffix=".part",
+            dir=dst_dir or "."
+        )
+        os.close(fd)
+        try:
+            _copy_file(src_path, part_path)
+            shutil.copymode(src_path, part_path)
+            os.replace(part_path, dst_path)
+        except BaseException:
+            try:
+                os.unlink(part_path)
+            except FileNotFoundError:
+                pass
+            raise
+        
+        os.remove(src_path)
+        return dst_path
+    
     def is_available(self) -> bool:
         """检查 ffmpeg 是否可用"""
-        try:
-            returncode, _, _ = self._run_command(
-                [self.config.ffmpeg_path, "-version"], 
-                timeout=10
-            )
-            return returncode == 0
-        except:
-            return False
+        return self.get_version() is not None
     
     def get_version(self) -> Optional[str]:
-        """获取 ffmpeg 版本"""
+        """
+        获取 ffmpeg 版本，不可用时返回 None
+        结果按 ffmpeg 路径缓存 VERSION_CACHE_TTL 秒，多个 client 共享
+        """
+        ffmpeg_path = self.config.ffmpeg_path
+        now = time.monotonic()
+        with _version_cache_lock:
+            cached = _version_cache.get(ffmpeg_path)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        version = None
         try:
-            returncode, stdout, _ = self._run_command(
-                [self.config.ffmpeg_path, "-version"],
-                timeout=10
-            )
+            returncode, stdout, _ = self._run_command([ffmpeg_path, "-version"], timeout=10)
             if returncode == 0:
-                first_line = stdout.split('\n')[0]
-                return first_line
-            return None
+                version = stdout.split('\n')[0]
         except:
-            return None
+            pass
+        
+        with _version_cache_lock:
+            _version_cache[ffmpeg_path] = (now + VERSION_CACHE_TTL, version)
+        return version
 
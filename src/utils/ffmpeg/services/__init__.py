@@ -6,10 +6,12 @@ from .service import (
     get_default_service,
     create_ffmpeg_service,
 )
+from .pool import FFmpegPool
 
 __all__ = [
     "FFmpegService",
     "get_default_service",
     "create_ffmpeg_service",
+    "FFmpegPool",
 ]
 
@@ -0,0 +1,97 @@
+"""
+FFmpeg 任务池
+并发执行多个相互独立的 FFmpeg 任务
+"""
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+from ..configs.config import FFmpegConfig, get_default_config
+
+T = TypeVar("T")
+
+
+class FFmpegPool:
+    """
+    FFmpeg 任务线程池
+    每个任务阻塞在 ffmpeg 子进程上，线程等待期间不占用 GIL；
+    并发数默认为 CPU 核数 / 每个任务的线程数，使总线程数与核数相当
+    
+    使用示例：
+        service = create_ffmpeg_service(FFmpegConfig(threads_per_job=2))
+        with FFmpegPool(service.config) as pool:
+            pool.warm()
+            results = pool.map([
+                lambda: service.mix_audio("a.mp4", "bgm.mp3", "out_a.mp4"),
+                lambda: service.mix_audio("b.mp4", "bgm.mp3", "out_b.mp4"),
+            ])
+    """
+    
+    def __init__(
+        self,
+        config: Optional[FFmpegConfig] = None,
+        max_workers: Optional[int] = None
+    ):
+        config = config or get_default_config()
+        self.config = config
+        self.max_workers = max_workers or config.get_max_concurrency()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="ffmpeg"
+        )
+    
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """提交单个任务，返回 Future"""
+        return self._executor.submit(fn, *args, **kwargs)
+    
+    def map(self, jobs: Iterable[Callable[[], T]]) -> List[T]:
+        """
+        并发执行一批无参任务，按提交顺序返回结果
+        任一任务抛出异常时在此处重新抛出
+        """
+        futures = [self._executor.submit(job) for job in jobs]
+        return [future.result() for future in futures]
+    
+    def warm(self, n: Optional[int] = None) -> int:
+        """
+        预热任务池：并发启动 n 个空转的 ffmpeg 进程（默认等于并发数）
+        让 ffmpeg 及其动态库进入页缓存，同时提前创建工作线程，
+        服务启动后的第一批真实任务不必承担冷启动开销
+        
+        Returns:
+            成功运行的预热进程数
+        """
+        n = self.max_workers if n is None else n
+        cmd = [
+            self.config.ffmpeg_path, "-hide_banner", "-loglevel", "quiet",
+            "-f", "lavfi", "-i", "nullsrc",
+            "-t", "0",
+            "-f", "null", "-"
+        ]
+        
+        def run_decoy() -> bool:
+            try:
+                # close_fds=False 以便走 posix_spawn，与 FFmpegClient 一致
+                completed = subprocess.run(
+                    cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=10,
+                    close_fds=False
+                )
+                return completed.returncode == 0
+            except (OSError, subprocess.TimeoutExpired):
+                return False
+        
+        return sum(self.map([run_decoy] * n))
+    
+    def shutdown(self, wait: bool = True):
+        """关闭任务池"""
+        self._executor.shutdown(wait=wait)
+    
+    def __enter__(self) -> "FFmpegPool":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -2,17 +2,22 @@
 FFmpeg Service
 提供视频处理功能
 """
-from typing import List, Optional
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from ..configs.config import FFmpegConfig
+from ..configs.config import FFmpegConfig, get_default_config
 from ..models.models import (
     VideoInfo,
     VideoCompareResult,
     ConcatResult,
     ConcatMode,
     MixAudioResult,
+    ExtractFramesResult,
+    ScanLibraryResult,
 )
 from ..providers.client import FFmpegClient, FFmpegClientConfig
+from .pool import FFmpegPool
 
 
 class FFmpegService:
@@ -22,18 +27,13 @@ class FFmpegService:
     """
     
     def __init__(self, config: Optional[FFmpegConfig] = None):
-        self.config = config or FFmpegConfig()
-        self.client: Optional[FFmpegClient] = None
+        self.config = config or get_default_config()
+        # 创建 client 只构建配置，不启动子进程，直接在构造时完成
+        self.client = FFmpegClient(self._build_client_config())
     
-    def init(self) -> bool:
-        """
-        初始化服务
-        
-        Returns:
-            是否初始化成功
-        """
-        # 创建客户端配置
-        client_config = FFmpegClientConfig(
+    def _build_client_config(self) -> FFmpegClientConfig:
+        """根据服务配置创建客户端配置"""
+        return FFmpegClientConfig(
             ffmpeg_path=self.config.ffmpeg_path,
             ffprobe_path=self.config.ffprobe_path,
             timeout=self.config.timeout,
@@ -43,25 +43,43 @@ class FFmpegService:
             audio_bitrate=self.config.audio_bitrate,
             temp_dir=self.config.temp_dir,
             log_level=self.config.log_level,
+            probe_cache_size=self.config.probe_cache_size,
+            probe_size=self.config.probe_size,
+            analyze_duration=self.config.analyze_duration,
+            threads_per_job=self.config.threads_per_job,
+            hwaccel=self.config.hwaccel,
+            hwaccel_device=self.config.hwaccel_device,
+            result_cache_dir=self.config.result_cache_dir,
         )
-        self.client = FFmpegClient(client_config)
+    
+    def init(self) -> bool:
+        """
+        检查服务是否可用（client 已在构造时创建）
         
+        Returns:
+            FFmpeg 是否可用
+        """
         return self.client.is_available()
     
-    def _ensure_client(self):
-        """确保 client 已初始化"""
-        if not self.client:
-            self.init()
-    
     # ==================== 核心功能 ====================
     
     def get_video_info(self, video_path: str) -> VideoInfo:
         """
         获取视频信息
         """
-        self._ensure_client()
         return self.client.get_video_info(video_path)
     
+    def get_video_infos(
+        self,
+        video_paths: List[str],
+        max_workers: Optional[int] = None
+    ) -> List[VideoInfo]:
+        """
+        批量获取视频信息（并发 probe），按输入顺序返回
+        max_workers 默认为 CPU 核数，ffprobe 以读取文件为主时可适当调大
+        """
+        return self.client.get_video_infos(video_paths, max_workers=max_workers)
+    
     def compare_videos(
         self, 
         video1_path: str, 
@@ -70,7 +88,6 @@ class FFmpegService:
         """
         比较两个视频是否兼容
         """
-        self._ensure_client()
         return self.client.compare_videos(video1_path, video2_path)
     
     def concat_videos(
@@ -94,7 +111,6 @@ class FFmpegService:
         Returns:
             ConcatResult 对象
         """
-        self._ensure_client()
         
         if len(video_paths) < 2:
             return ConcatResult(
@@ -107,8 +123,11 @@ class FFmpegService:
             mode = self._detect_concat_mode(video_paths)
         elif mode is None:
             mode = ConcatMode.COPY
+        else:
+            # 兼容传入字符串 "copy"/"reencode"
+            mode = ConcatMode(mode)
         
-        if mode == ConcatMode.COPY:
+        if mode is ConcatMode.COPY:
             return self.client.concat_copy(video_paths, output_path)
         else:
             return self.client.concat_reencode(video_paths, output_path, **kwargs)
@@ -121,7 +140,6 @@ class FFmpegService:
         """
         不重新编码拼接视频
         """
-        self._ensure_client()
         return self.client.concat_copy(video_paths, output_path)
     
     def concat_videos_reencode(
@@ -138,7 +156,6 @@ class FFmpegService:
         """
         重新编码拼接视频
         """
-        self._ensure_client()
         return self.client.concat_reencode(
             video_paths=video_paths,
             output_path=output_path,
@@ -181,7 +198,6 @@ class FFmpegService:
         Returns:
             MixAudioResult 对象
         """
-        self._ensure_client()
         return self.client.mix_audio(
             video_path=video_path,
             audio_path=audio_path,
@@ -194,6 +210,106 @@ class FFmpegService:
             audio_bitrate=audio_bitrate
         )
     
+    def concat_mix_audio(
+        self,
+        video_paths: List[str],
+        audio_path: str,
+        output_path: str,
+        loop_audio: bool = True,
+        replace_original: bool = True,
+        audio_volume: float = 1.0,
+        original_volume: float = 0.0,
+        audio_codec: Optional[str] = None,
+        audio_bitrate: Optional[str] = None
+    ) -> MixAudioResult:
+        """
+        不重新编码拼接视频并添加背景音乐
+        两个 ffmpeg 进程通过管道串联，不生成中间文件
+        """
+        return self.client.concat_mix_audio(
+            video_paths=video_paths,
+            audio_path=audio_path,
+            output_path=output_path,
+            loop_audio=loop_audio,
+            replace_original=replace_original,
+            audio_volume=audio_volume,
+            original_volume=original_volume,
+            audio_codec=audio_codec,
+            audio_bitrate=audio_bitrate
+        )
+    
+    # ==================== 视频抽帧 ====================
+    
+    def extract_frames(
+        self,
+        video_path: str,
+        timestamps: List[float],
+        output_dir: str,
+        image_format: str = "jpg"
+    ) -> ExtractFramesResult:
+        """
+        按时间点批量抽取视频帧（单次 ffmpeg 调用）
+        """
+        return self.client.extract_frames(
+            video_path=video_path,
+            timestamps=timestamps,
+            output_dir=output_dir,
+            image_format=image_format
+        )
+    
+    def iter_frames(
+        self,
+        video_path: str,
+        fps: Optional[float] = None,
+        scale: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        流式读取视频帧（MJPEG 管道，不落盘），每次产出一张 JPEG 图片
+        """
+        return self.client.iter_frames(video_path, fps=fps, scale=scale)
+    
+    # ==================== 批量任务 ====================
+    
+    def run_batch(
+        self,
+        calls: List[Callable[[], Any]],
+        max_workers: Optional[int] = None
+    ) -> List[Any]:
+        """
+        并发执行一批相互独立的任务，按提交顺序返回结果
+        并发数默认由配置决定（见 FFmpegConfig.get_max_concurrency）
+        """
+        with FFmpegPool(self.config, max_workers=max_workers) as pool:
+            return pool.map(calls)
+    
+    def concat_videos_batch(
+        self,
+        specs: List[dict],
+        max_workers: Optional[int] = None
+    ) -> List[ConcatResult]:
+        """
+        并发执行多个拼接任务
+        
+        Args:
+            specs: 每个任务的 concat_videos 参数字典
+            max_workers: 最大并发数
+        """
+        return self.run_batch([partial(self.concat_videos, **spec) for spec in specs], max_workers)
+    
+    def mix_audio_batch(
+        self,
+        specs: List[dict],
+        max_workers: Optional[int] = None
+    ) -> List[MixAudioResult]:
+        """
+        并发执行多个混音任务
+        
+        Args:
+            specs: 每个任务的 mix_audio 参数字典
+            max_workers: 最大并发数
+        """
+        return self.run_batch([partial(self.mix_audio, **spec) for spec in specs], max_workers)
+    
     # ==================== 工具方法 ====================
     
     def _detect_concat_mode(self, video_paths: List[str]) -> ConcatMode:
@@ -201,30 +317,82 @@ class FFmpegService:
         if len(video_paths) < 2:
             return ConcatMode.COPY
         
-        first_video = video_paths[0]
+        infos = self._get_unique_infos(video_paths)
+        first_info = infos[video_paths[0]]
         
         for video_path in video_paths[1:]:
-            result = self.client.compare_videos(first_video, video_path)
-            if not result.is_compatible:
+            if not self.client.video_infos_compatible(first_info, infos[video_path]):
                 return ConcatMode.REENCODE
         
         return ConcatMode.COPY
     
+    def _get_unique_infos(self, video_paths: List[str]) -> Dict[str, VideoInfo]:
+        """每个不同路径只获取一次视频信息，多个文件并发 probe"""
+        unique_paths = list(dict.fromkeys(video_paths))
+        return dict(zip(unique_paths, self.client.get_video_infos(unique_paths)))
+    
+    def move_output(self, src_path: str, dst_path: str) -> str:
+        """
+        将输出文件移动到最终位置（同文件系统 rename，跨文件系统内核复制）
+        """
+        return self.client.move_output(src_path, dst_path)
+    
+    def scan_library(
+        self,
+        video_paths: List[str],
+        fps_tolerance: float = 0.1
+    ) -> ScanLibraryResult:
+        """
+        扫描大量视频，按参数是否兼容（可不重新编码拼接）分组
+        每个文件只 probe 一次；分组按参数哈希查找，不做两两比较
+        
+        Args:
+            video_paths: 视频文件路径列表
+            fps_tolerance: 帧率允许的误差，与 compare_video_infos 一致
+        
+        Returns:
+            扫描结果：groups 为分组后的路径列表，组与组内顺序均为首次出现顺序；
+            failed 为无法读取的文件，单个文件失败不影响其余文件分组
+        """
+        
+        unique_paths = list(dict.fromkeys(video_paths))
+        failed: Dict[str, str] = {}
+        probed = self.client.get_video_infos(unique_paths, errors=failed)
+        probed_paths = [path for path in unique_paths if path not in failed]
+        infos = dict(zip(probed_paths, probed))
+        # 除帧率外的参数 -> [(组内首个文件的帧率, 路径列表), ...]
+        buckets: Dict[Tuple, List[Tuple[float, List[str]]]] = {}
+        groups: List[List[str]] = []
+        
+        for path, info in infos.items():
+            key = (
+                info.video_codec, info.width, info.height,
+                info.audio_codec, info.sample_rate, info.channels
+            )
+            candidates = buckets.setdefault(key, [])
+            for fps, members in candidates:
+                if abs(info.fps - fps) <= fps_tolerance:
+                    members.append(path)
+                    break
+            else:
+                members = [path]
+                candidates.append((info.fps, members))
+                groups.append(members)
+        
+        return ScanLibraryResult(groups=groups, failed=failed)
+    
     def is_available(self) -> bool:
         """检查 FFmpeg 是否可用"""
-        self._ensure_client()
         return self.client.is_available()
     
     def get_version(self) -> Optional[str]:
         """获取 FFmpeg 版本"""
-        self._ensure_client()
         return self.client.get_version()
     
     def check_compatibility(self, video_paths: List[str]) -> dict:
         """
         检查多个视频的兼容性
         """
-        self._ensure_client()
         
         if len(video_paths) < 2:
             return {
@@ -235,29 +403,40 @@ class FFmpegService:
             }
         
         comparisons = []
-        all_differences = []
+        # dict 去重并保持差异首次出现的顺序
+        all_differences: Dict[str, None] = {}
         all_compatible = True
         
+        # 每个文件只 probe 一次，之后的比较都是纯内存计算
+        infos = self._get_unique_infos(video_paths)
         first_video = video_paths[0]
+        first_info = infos[first_video]
         
-        for i, video_path in enumerate(video_paths[1:], start=1):
-            result = self.client.compare_videos(first_video, video_path)
+        for video_path in video_paths[1:]:
+            info = infos[video_path]
+            # 兼容的视频没有差异项，只有不兼容时才生成差异描述
+            if self.client.video_infos_compatible(first_info, info):
+                compatible, differences = True, []
+            else:
+                result = self.client.compare_video_infos(first_info, info)
+                compatible, differences = result.is_compatible, result.differences
+            
             comparisons.append({
                 "video1": first_video,
                 "video2": video_path,
-                "compatible": result.is_compatible,
-                "differences": result.differences
+                "compatible": compatible,
+                "differences": differences
             })
             
-            if not result.is_compatible:
+            if not compatible:
                 all_compatible = False
-                all_differences.extend(result.differences)
+                all_differences.update(dict.fromkeys(differences))
         
         return {
             "compatible": all_compatible,
             "recommended_mode": ConcatMode.COPY if all_compatible else ConcatMode.REENCODE,
             "comparisons": comparisons,
-            "all_differences": list(set(all_differences))
+            "all_differences": list(all_differences)
         }
 
 
@@ -265,6 +444,7 @@ class FFmpegService:
 
 # 默认服务实例（懒加载）
 _default_service: Optional[FFmpegService] = None
+_default_service_lock = threading.Lock()
 
 
 def get_default_service() -> FFmpegService:
@@ -274,8 +454,11 @@ def get_default_service() -> FFmpegService:
     """
     global _default_service
     if _default_service is None:
-        _default_service = FFmpegService()
-        _default_service.init()
+        with _default_service_lock:
+            if _default_service is None:
+                service = FFmpegService()
+                service.init()
+                _default_service = service
     return _default_service
 
 
@@ -36,7 +36,14 @@ from .providers.base import BaseLogProvider
 from .services.service import LogService, get_log_service, create_default_log_service
 
 # Providers
-from .providers import OpenSearchProvider, OpenSearchConfig
+from .providers import (
+    OpenSearchProvider,
+    OpenSearchConfig,
+    ForwardProvider,
+    ForwardConfig,
+    FileLogProvider,
+    FileLogConfig,
+)
 
 __all__ = [
     # 配置
@@ -51,6 +58,10 @@ __all__ = [
     # Providers
     "OpenSearchProvider",
     "OpenSearchConfig",
+    "ForwardProvider",
+    "ForwardConfig",
+    "FileLogProvider",
+    "FileLogConfig",
 ]
 
 __version__ = "2.0.0"
@@ -5,7 +5,13 @@
 """
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List, Literal
+
+from ..models.models import LogLevel
+
+
+# 缓冲区已满时的处理策略
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
 
 
 @dataclass
@@ -16,7 +22,44 @@ class LogServiceConfig:
     属性：
         default_providers: 默认启用的 Provider 名称列表
         fail_silently: 写入失败时是否静默（不抛异常）
+        async_write: 是否后台异步写入（log 只入队，由后台线程写入 Provider）
+        queue_capacity: 异步缓冲区容量（所有写入线程合计）
+        overflow_policy: 缓冲区已满时的策略：drop_oldest（丢弃最早的）、drop_newest（丢弃新日志）、block（阻塞等待）
+        auto_batch: 后台线程是否等待凑批后再写入
+        bulk_size: 每批最多写入的日志条数
+        flush_interval_ms: 凑批最长等待时间（毫秒）
+        sample_rates: 各日志级别的采样率（0~1），未列出的级别按 1.0 处理
+        executor_workers: 同步写入模式下 alog 等协程方法使用的线程数
     """
     default_providers: List[str] = field(default_factory=lambda: ["opensearch"])
     fail_silently: bool = True  # 生产环境建议开启，避免日志异常影响主业务
+    
+    # 异步写入：日志写入不再占用调用线程的网络往返
+    async_write: bool = True
+    # 缓冲区有上限（所有写入线程合计），日志后端变慢时内存不会无限增长；默认丢弃最早的日志，写入方永不阻塞
+    queue_capacity: int = 100_000
+    overflow_policy: Literal["drop_oldest", "drop_newest", "block"] = "drop_oldest"
+    
+    # 合并写入：攒够 bulk_size 条或等待 flush_interval_ms 后调用一次 bulk_write
+    auto_batch: bool = True
+    bulk_size: int = 500
+    flush_interval_ms: int = 200
+    
+    # 采样：高频的普通日志可按比例丢弃，被丢弃的日志不创建 LogEntry，也不写入
+    # ERROR 默认始终全量记录
+    sample_rates: Dict[LogLevel, float] = field(default_factory=lambda: {
+        LogLevel.LOG: 1.0,
+        LogLevel.WARN: 1.0,
+        LogLevel.ERROR: 1.0,
+    })
+    
+    # 协程写入（alog/ainfo/...）：同步写入模式下把阻塞的 Provider 调用放到线程池，不阻塞事件循环
+    executor_workers: int = 4
+    
+    def __post_init__(self):
+        """初始化后验证"""
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"不支持的 overflow_policy: {self.overflow_policy}，可选值: {', '.join(OVERFLOW_POLICIES)}"
+            )
 
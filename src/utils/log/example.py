@@ -6,10 +6,13 @@
 
 from log import (
     LogService,
+    LogServiceConfig,
     LogEntry,
     LogLevel,
     OpenSearchProvider,
     OpenSearchConfig,
+    FileLogProvider,
+    FileLogConfig,
     create_default_log_service,
 )
 
@@ -83,14 +86,17 @@ def example_multi_provider():
     print("=" * 50)
     
     LogService.reset_instance()
-    service = LogService()
+    # 默认同时写入 OpenSearch 和本地文件
+    service = LogService(LogServiceConfig(default_providers=["opensearch", "file"]))
     
     # 注册 OpenSearch
     service.register_provider(OpenSearchProvider())
     
+    # 注册本地文件
+    service.register_provider(FileLogProvider(FileLogConfig(path="logs/example.log")))
+    
     # 未来可以注册更多 Provider：
     # service.register_provider(ElasticsearchProvider())
-    # service.register_provider(FileLogProvider())
     # service.register_provider(CloudWatchProvider())
     
     print(f"已注册: {service.list_providers()}")
@@ -99,8 +105,9 @@ def example_multi_provider():
     init_results = service.init()
     print(f"初始化: {init_results}")
     
-    # 写入到所有 Provider
+    # 写入到默认的所有 Provider
     results = service.info("Multi-provider test", service="demo")
+    service.flush()  # 等待后台线程写入完成
     print(f"写入结果: {results}")
     
     # 指定特定 Provider（只写入到 opensearch）
@@ -109,6 +116,7 @@ def example_multi_provider():
         service="demo",
         providers=["opensearch"]
     )
+    service.flush()
     print(f"指定 Provider 写入: {results}")
 
 
@@ -120,11 +128,10 @@ def example_bulk_write():
     
     service = LogService.get_instance()
     
-    # 创建多条日志
-    entries = [
-        LogEntry(message=f"Batch log {i}", level=LogLevel.LOG, service="batch")
-        for i in range(5)
-    ]
+    # 创建多条日志（共用同一个时间戳）
+    entries = LogEntry.batch_now(
+        (f"Batch log {i}" for i in range(5)), level=LogLevel.LOG, service="batch"
+    )
     
     # 批量写入
     results = service.bulk_log(entries)
@@ -159,8 +166,7 @@ def example_multi_index():
     
     # 批量写入到不同索引
     entries = [
-        LogEntry(message="Auth log 1", service="auth", index="logs-auth"),
-        LogEntry(message="Auth log 2", service="auth", index="logs-auth"),
+        *LogEntry.batch_now(["Auth log 1", "Auth log 2"], service="auth", index="logs-auth"),
         LogEntry(message="Payment log 1", service="payment", index="logs-payment"),
     ]
     results = service.bulk_log(entries)
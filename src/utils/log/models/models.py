@@ -6,10 +6,22 @@
 - LogEntry: 日志条目
 """
 
-from dataclasses import dataclass
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+# 优先使用 orjson 序列化（C 实现，直接输出 bytes）；未安装时回退到标准库
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode()
 
 
 class LogLevel(Enum):
@@ -19,12 +31,45 @@ class LogLevel(Enum):
     ERROR = "error"  # 错误
 
 
-@dataclass
+# 日志级别对应的字符串，to_dict 时查表代替 isinstance 判断
+_LEVEL_STR: Dict[Any, str] = {level: level.value for level in LogLevel}
+
+# 最近一次格式化的时间戳 (datetime, isoformat 字符串)
+# 同一批次的日志共用一个 datetime 对象时只格式化一次
+_last_iso: tuple = (None, "")
+
+
+def _format_message(message: str, args: tuple) -> str:
+    """
+    按 % 格式化消息（与标准库 logging 相同：单个非空字典参数按命名占位符处理）
+    格式化失败时返回原始模板，不影响日志写入
+    """
+    if len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+        args = args[0]
+    try:
+        return message % args
+    except Exception:
+        return message
+
+
+def _isoformat(ts: datetime) -> str:
+    """格式化时间戳，与上一次是同一个 datetime 对象时直接复用结果"""
+    global _last_iso
+    last_ts, last_iso = _last_iso
+    if ts is last_ts:
+        return last_iso
+    iso = ts.isoformat()
+    _last_iso = (ts, iso)
+    return iso
+
+
+@dataclass(slots=True)
 class LogEntry:
     """
     日志条目模型
     
     所有 Provider 共用的标准日志格式
+    使用 __slots__，批量写入时大量实例不再各自携带 __dict__
     """
     message: str                              # 日志消息（必填）
     level: LogLevel = LogLevel.LOG            # 日志级别
@@ -36,6 +81,33 @@ class LogEntry:
     metadata: Optional[Dict[str, Any]] = None # 扩展元数据
     timestamp: Optional[datetime] = None      # 时间戳
     index: Optional[str] = None               # 目标索引（用于 OpenSearch 等）
+    args: Tuple[Any, ...] = field(default=(), repr=False)  # message 的 % 格式化参数，序列化时才格式化
+    _ts_iso: str = field(init=False, default="", repr=False, compare=False)  # 时间戳字符串缓存
+    
+    @classmethod
+    def batch_now(
+        cls,
+        messages: Iterable[str],
+        level: LogLevel = LogLevel.LOG,
+        service: str = "default",
+        **kwargs
+    ) -> List["LogEntry"]:
+        """
+        批量创建日志条目，共用同一个时间戳
+        
+        只取一次当前时间，所有条目引用同一个 datetime 对象，
+        序列化时时间戳字符串也只格式化一次
+        
+        Args:
+            messages: 日志消息列表
+            level: 日志级别
+            service: 服务类别
+            **kwargs: 其他 LogEntry 字段（user、index 等），所有条目相同
+        Returns:
+            日志条目列表
+        """
+        ts = datetime.now().astimezone()
+        return [cls(message=m, level=level, service=service, timestamp=ts, **kwargs) for m in messages]
     
     def __post_init__(self):
         """初始化后自动设置时间戳"""
@@ -44,9 +116,19 @@ class LogEntry:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
+        # 时间戳字符串在首次序列化时生成（通常在后台写入线程中），之后复用
+        ts_iso = self._ts_iso
+        if not ts_iso:
+            ts_iso = self._ts_iso = _isoformat(self.timestamp)
+        
+        # 延迟格式化：结果写回 message，多个 Provider 序列化时只格式化一次
+        if self.args:
+            self.message = _format_message(self.message, self.args)
+            self.args = ()
+        
         doc = {
-            "timestamp": self.timestamp.isoformat(),
-            "level": self.level.value if isinstance(self.level, LogLevel) else self.level,
+            "timestamp": ts_iso,
+            "level": _LEVEL_STR.get(self.level, self.level),
             "message": self.message,
             "service": self.service,
         }
@@ -63,4 +145,8 @@ class LogEntry:
             doc["metadata"] = self.metadata
         
         return doc
+    
+    def to_json(self) -> bytes:
+        """序列化为 JSON bytes（写入 OpenSearch 时作为请求体，不再二次序列化）"""
+        return _json_dumps(self.to_dict())
 
@@ -5,9 +5,15 @@
 """
 
 from .opensearch import OpenSearchProvider, OpenSearchConfig
+from .forward import ForwardProvider, ForwardConfig
+from .file import FileLogProvider, FileLogConfig
 
 __all__ = [
     "OpenSearchProvider",
     "OpenSearchConfig",
+    "ForwardProvider",
+    "ForwardConfig",
+    "FileLogProvider",
+    "FileLogConfig",
 ]
 
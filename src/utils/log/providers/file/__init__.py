@@ -0,0 +1,13 @@
+"""
+File 日志工具包
+
+将日志以 JSON 行追加写入本地文件
+"""
+
+from .config import FileLogConfig
+from .provider import FileLogProvider
+
+__all__ = [
+    "FileLogConfig",
+    "FileLogProvider",
+]
@@ -0,0 +1,24 @@
+"""
+File 配置模块
+
+定义日志文件路径配置
+"""
+
+from dataclasses import dataclass
+import os
+
+
+@dataclass
+class FileLogConfig:
+    """
+    File 配置类
+    """
+    # 日志文件路径，所在目录不存在时自动创建
+    path: str = "logs/app.log"
+    
+    @classmethod
+    def from_env(cls) -> "FileLogConfig":
+        """从环境变量加载配置"""
+        return cls(
+            path=os.getenv("LOG_FILE_PATH", cls.path),
+        )
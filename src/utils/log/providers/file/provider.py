@@ -0,0 +1,108 @@
+"""
+File Provider 模块
+
+实现 BaseLogProvider 接口，将日志以 JSON 行追加写入本地文件
+"""
+
+import os
+from typing import Optional, List, Tuple
+
+from ..base import BaseLogProvider
+from ...models.models import LogEntry
+from .config import FileLogConfig
+
+
+# 单次 writev 最多提交的缓冲区数
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+class FileLogProvider(BaseLogProvider):
+    """
+    File 日志 Provider
+    
+    以 O_APPEND 打开文件，bulk_write 把一批日志通过 os.writev 一次系统调用写入；
+    不支持 writev 的平台拼接后调用一次 os.write
+    """
+    
+    name = "file"
+    
+    def __init__(self, config: Optional[FileLogConfig] = None):
+        """
+        初始化 Provider
+        
+        Args:
+            config: File 配置，为 None 时使用默认配置
+        """
+        self.config = config or FileLogConfig()
+        self._fd: Optional[int] = None
+        self._written = 0
+    
+    def init(self, force: bool = False) -> bool:
+        """打开日志文件"""
+        if self._fd is not None:
+            if not force:
+                return True
+            self.close()
+        
+        try:
+            directory = os.path.dirname(self.config.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fd = os.open(self.config.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        except OSError as e:
+            print(f"[{self.name}] 无法打开日志文件 {self.config.path}: {e}")
+            return False
+        return True
+    
+    def is_ready(self) -> bool:
+        """检查是否就绪"""
+        return self._fd is not None
+    
+    def _write_lines(self, lines: List[bytes]) -> bool:
+        """写入多行，部分写入时继续写完剩余内容"""
+        if self._fd is None and not self.init():
+            return False
+        fd = self._fd
+        try:
+            if hasattr(os, "writev"):
+                for i in range(0, len(lines), _IOV_MAX):
+                    chunk = lines[i:i + _IOV_MAX]
+                    total = sum(len(line) for line in chunk)
+                    written = os.writev(fd, chunk)
+                    if written < total:
+                        rest = memoryview(b"".join(chunk))[written:]
+                        while rest:
+                            rest = rest[os.write(fd, rest):]
+            else:
+                rest = memoryview(b"".join(lines))
+                while rest:
+                    rest = rest[os.write(fd, rest):]
+        except OSError as e:
+            print(f"[{self.name}] 写入失败: {e}")
+            return False
+        self._written += len(lines)
+        return True
+    
+    def write(self, entry: LogEntry) -> Optional[str]:
+        """写入单条日志，返回写入序号"""
+        return str(self._written) if self._write_lines([entry.to_json() + b"\n"]) else None
+    
+    def bulk_write(self, entries: List[LogEntry]) -> Tuple[int, int]:
+        """批量写入日志（一次 writev）"""
+        if not entries:
+            return 0, 0
+        lines = [entry.to_json() + b"\n" for entry in entries]
+        if self._write_lines(lines):
+            return len(entries), 0
+        return 0, len(entries)
+    
+    def close(self) -> None:
+        """关闭文件"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
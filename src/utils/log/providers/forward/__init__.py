@@ -0,0 +1,13 @@
+"""
+Forward 日志工具包
+
+将日志通过 UDP / Unix 数据报发送给本机的日志 Agent（Fluent Bit、Vector 等）
+"""
+
+from .config import ForwardConfig
+from .provider import ForwardProvider
+
+__all__ = [
+    "ForwardConfig",
+    "ForwardProvider",
+]
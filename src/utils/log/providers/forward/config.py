@@ -0,0 +1,33 @@
+"""
+Forward 配置模块
+
+定义日志 Agent 的地址配置
+"""
+
+from dataclasses import dataclass
+import os
+from typing import Optional
+
+
+@dataclass
+class ForwardConfig:
+    """
+    Forward 配置类
+    
+    设置 socket_path 时使用 Unix 数据报套接字，否则使用 UDP 发送到 host:port
+    """
+    # UDP 地址（Fluent Bit in_udp 默认端口 5170）
+    host: str = "127.0.0.1"
+    port: int = 5170
+    
+    # Unix 数据报套接字路径，设置后优先于 UDP
+    socket_path: Optional[str] = None
+    
+    @classmethod
+    def from_env(cls) -> "ForwardConfig":
+        """从环境变量加载配置"""
+        return cls(
+            host=os.getenv("LOG_FORWARD_HOST", cls.host),
+            port=int(os.getenv("LOG_FORWARD_PORT", cls.port)),
+            socket_path=os.getenv("LOG_FORWARD_SOCKET_PATH") or None,
+        )
@@ -0,0 +1,111 @@
+"""
+Forward Provider 模块
+
+实现 BaseLogProvider 接口，把日志以 JSON 行的形式发送给本机日志 Agent，
+由 Agent 负责攒批、重试和投递到 OpenSearch
+"""
+
+import socket
+import time
+from typing import Optional, List, Tuple
+
+from ..base import BaseLogProvider
+from ...models.models import LogEntry
+from .config import ForwardConfig
+
+
+# 连接 Agent 失败后，写入时自动重连的最短间隔（秒）
+_RECONNECT_INTERVAL = 5.0
+
+
+class ForwardProvider(BaseLogProvider):
+    """
+    Forward 日志 Provider
+    
+    每条日志是一个数据报，发送不等待应答；Agent 不在线或发送缓冲区已满时该条日志丢弃
+    """
+    
+    name = "forward"
+    
+    def __init__(self, config: Optional[ForwardConfig] = None):
+        """
+        初始化 Provider
+        
+        Args:
+            config: Forward 配置，为 None 时使用默认配置
+        """
+        self.config = config or ForwardConfig()
+        self._sock: Optional[socket.socket] = None
+        self._sent = 0
+        self._next_retry = 0.0            # 连接失败后，下次允许自动重连的时间（monotonic）
+        self._connect_error_reported = False  # 连接失败只提示一次，重连成功后复位
+    
+    def init(self, force: bool = False) -> bool:
+        """创建套接字并连接到 Agent 地址"""
+        if self._sock is not None:
+            if not force:
+                return True
+            self.close()
+        
+        if self.config.socket_path:
+            family, address = socket.AF_UNIX, self.config.socket_path
+        else:
+            family, address = socket.AF_INET, (self.config.host, self.config.port)
+        
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            # 连接后发送时不再逐条解析地址
+            sock.connect(address)
+        except OSError as e:
+            sock.close()
+            self._next_retry = time.monotonic() + _RECONNECT_INTERVAL
+            if not self._connect_error_reported:
+                print(f"[{self.name}] 无法连接到日志 Agent {address}: {e}")
+                self._connect_error_reported = True
+            return False
+        sock.setblocking(False)
+        self._sock = sock
+        self._connect_error_reported = False
+        return True
+    
+    def is_ready(self) -> bool:
+        """检查是否就绪"""
+        return self._sock is not None
+    
+    def _ensure_socket(self) -> bool:
+        """未连接时尝试重连，连接失败后 _RECONNECT_INTERVAL 秒内不再重试"""
+        if self._sock is not None:
+            return True
+        if time.monotonic() < self._next_retry:
+            return False
+        return self.init()
+    
+    def _send(self, entry: LogEntry) -> bool:
+        """发送一条日志（调用前已确认套接字可用），失败返回 False"""
+        try:
+            self._sock.send(entry.to_json() + b"\n")
+        except OSError:
+            # 缓冲区已满（BlockingIOError）、Agent 未监听或数据报过大
+            return False
+        self._sent += 1
+        return True
+    
+    def write(self, entry: LogEntry) -> Optional[str]:
+        """写入单条日志，返回发送序号"""
+        if not self._ensure_socket():
+            return None
+        return str(self._sent) if self._send(entry) else None
+    
+    def bulk_write(self, entries: List[LogEntry]) -> Tuple[int, int]:
+        """批量写入日志（逐条发送数据报）"""
+        if not self._ensure_socket():
+            return 0, len(entries)
+        send = self._send
+        success = sum(1 for entry in entries if send(entry))
+        return success, len(entries) - success
+    
+    def close(self) -> None:
+        """关闭套接字"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
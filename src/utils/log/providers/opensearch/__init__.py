@@ -6,9 +6,11 @@ OpenSearch 日志工具包
 
 from .config import OpenSearchConfig
 from .provider import OpenSearchProvider
+from .async_client import AsyncOpenSearchClient
 
 __all__ = [
     "OpenSearchConfig",
     "OpenSearchProvider",
+    "AsyncOpenSearchClient",
 ]
 
@@ -0,0 +1,131 @@
+"""
+OpenSearch 异步客户端模块
+
+基于 AsyncOpenSearch（aiohttp 传输），写入方法均为协程，
+多个写入请求可在同一个事件循环中并发进行
+"""
+
+import asyncio
+from typing import Optional, List, Dict, Any, Tuple, Union
+
+from .config import OpenSearchConfig, INDEX_MAPPING
+from .client import build_client_params, iter_bulk_bodies, parse_bulk_response
+
+
+class AsyncOpenSearchClient:
+    """
+    OpenSearch 异步客户端封装
+    
+    依赖 opensearch-py 的异步扩展（需要安装 aiohttp），首次使用时才导入
+    """
+    
+    def __init__(self, config: Optional[OpenSearchConfig] = None):
+        self.config = config or OpenSearchConfig()
+        self._client = None
+    
+    @property
+    def client(self):
+        """懒加载获取客户端"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+    
+    def _create_client(self):
+        """创建 AsyncOpenSearch 客户端"""
+        from opensearchpy import AsyncOpenSearch
+        
+        # AIOHttpConnection 的连接池大小参数名为 maxsize
+        return AsyncOpenSearch(maxsize=self.config.pool_maxsize, **build_client_params(self.config))
+    
+    async def ping(self) -> bool:
+        """测试连接"""
+        try:
+            return await self.client.ping()
+        except Exception:
+            return False
+    
+    async def index_exists(self, index_name: Optional[str] = None) -> bool:
+        """检查索引是否存在"""
+        index_name = index_name or self.config.index_name
+        return await self.client.indices.exists(index=index_name)
+    
+    async def create_index(self, index_name: Optional[str] = None, force: bool = False) -> bool:
+        """
+        创建索引
+        
+        Args:
+            index_name: 索引名称
+            force: 是否强制重建（删除已有索引后重新创建）
+        Returns:
+            True 表示索引可用（已存在或新建成功）
+        """
+        index_name = index_name or self.config.index_name
+        
+        if await self.index_exists(index_name):
+            if not force:
+                print(f"索引 '{index_name}' 已存在，继续使用")
+                return True
+            print(f"索引 '{index_name}' 已存在，强制删除重建")
+            await self.client.indices.delete(index=index_name)
+        
+        body = {
+            "settings": {
+                "number_of_shards": self.config.number_of_shards,
+                "number_of_replicas": self.config.number_of_replicas,
+            },
+            "mappings": INDEX_MAPPING,
+        }
+        
+        try:
+            await self.client.indices.create(index=index_name, body=body)
+            print(f"索引 '{index_name}' 创建成功")
+            return True
+        except Exception as e:
+            print(f"创建索引失败: {e}")
+            return False
+    
+    async def index_document(self, document: Union[Dict[str, Any], bytes], index_name: Optional[str] = None) -> Dict[str, Any]:
+        """写入单个文档（document 可以是已序列化的 JSON bytes）"""
+        index_name = index_name or self.config.index_name
+        try:
+            return await self.client.index(index=index_name, body=document)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def bulk_index(self, documents: List[Union[Dict[str, Any], bytes]], index_name: Optional[str] = None) -> Tuple[int, int]:
+        """批量写入文档（NDJSON 请求体，文档可以是 dict 或已序列化的 JSON bytes）"""
+        index_name = index_name or self.config.index_name
+        
+        dumps = self.client.transport.serializer.dumps
+        sources = [doc if isinstance(doc, bytes) else dumps(doc).encode() for doc in documents]
+        
+        total_success = 0
+        total_failed = 0
+        for body, count in iter_bulk_bodies(sources, self.config.bulk_size, self.config.bulk_max_bytes):
+            try:
+                success, failed = parse_bulk_response(await self.client.bulk(body=body, index=index_name), count)
+            except Exception:
+                success, failed = 0, count
+            total_success += success
+            total_failed += failed
+        return total_success, total_failed
+    
+    async def bulk_index_grouped(self, grouped: Dict[str, List[Union[Dict[str, Any], bytes]]]) -> Tuple[int, int]:
+        """
+        多个索引并发批量写入
+        
+        Args:
+            grouped: {索引名: 文档列表}
+        Returns:
+            (成功数, 失败数)
+        """
+        results = await asyncio.gather(
+            *(self.bulk_index(documents, index_name=index_name) for index_name, documents in grouped.items())
+        )
+        return sum(r[0] for r in results), sum(r[1] for r in results)
+    
+    async def close(self) -> None:
+        """关闭连接"""
+        if self._client:
+            await self._client.close()
+            self._client = None
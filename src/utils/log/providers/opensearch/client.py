@@ -4,55 +4,158 @@ OpenSearch 客户端模块
 封装与 OpenSearch 集群的底层交互
 """
 
-from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, Union, Iterator, Iterable
+import json
+import threading
 import warnings
 
-from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
+from opensearchpy import OpenSearch, Urllib3HttpConnection
 
 from .config import OpenSearchConfig, INDEX_MAPPING
 
 
+# _bulk 请求中每个文档的动作行，索引名放在请求路径中
+_BULK_ACTION_LINE = b'{"index":{}}\n'
+
+
+@lru_cache(maxsize=256)
+def _action_line(index_name: str) -> bytes:
+    """
+    获取指定索引的动作行 b'{"index":{"_index":"..."}}\n'，多索引合并为一个请求时使用
+    
+    按索引名缓存，常用索引只序列化一次；按日期滚动的索引名不会让缓存无限增长
+    """
+    return json.dumps({"index": {"_index": index_name}}, separators=(",", ":")).encode() + b"\n"
+
+
+# 连接参数相同的 OpenSearchClient 共享同一个 OpenSearch 实例（及其连接池）
+# 键为连接参数元组，值为 [OpenSearch 实例, 引用计数]
+_CLIENT_CACHE: Dict[tuple, list] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+_cert_warnings_ignored = False
+
+
+def _ignore_cert_warnings() -> None:
+    """关闭证书校验时忽略相关警告，过滤器只注册一次，避免重复创建客户端时不断追加"""
+    global _cert_warnings_ignored
+    if not _cert_warnings_ignored:
+        warnings.filterwarnings("ignore", message=".*verify_certs.*")
+        warnings.filterwarnings("ignore", message=".*Unverified HTTPS.*")
+        _cert_warnings_ignored = True
+
+
+def build_client_params(config: OpenSearchConfig) -> Dict[str, Any]:
+    """根据配置生成 OpenSearch / AsyncOpenSearch 的构造参数"""
+    if not config.verify_certs:
+        _ignore_cert_warnings()
+    
+    client_params = {
+        "hosts": config._hosts,
+        "http_auth": (config.username, config.password),
+        "use_ssl": config.use_ssl,
+        "verify_certs": config.verify_certs,
+        "http_compress": config.http_compress,
+        "max_retries": config.max_retries,
+        "retry_on_timeout": config.retry_on_timeout,
+    }
+    if config._url_prefix:
+        client_params["url_prefix"] = config._url_prefix
+    return client_params
+
+
+def iter_bulk_bodies(
+    sources: Iterable[bytes],
+    max_docs: int,
+    max_bytes: int,
+    action_line: bytes = _BULK_ACTION_LINE,
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    将已序列化的文档拼接为 NDJSON 请求体
+    
+    超过 max_docs 条或 max_bytes 字节时拆分为多个请求体
+    
+    Args:
+        sources: 已序列化的文档；元素为 (动作行, 文档) 元组时使用各自的动作行
+        action_line: 默认动作行
+    Yields:
+        (请求体, 文档数)
+    """
+    parts: List[bytes] = []
+    size = 0
+    for source in sources:
+        if isinstance(source, tuple):
+            line = source[0] + source[1] + b"\n"
+        else:
+            line = action_line + source + b"\n"
+        if parts and (len(parts) >= max_docs or size + len(line) > max_bytes):
+            yield b"".join(parts), len(parts)
+            parts, size = [], 0
+        parts.append(line)
+        size += len(line)
+    if parts:
+        yield b"".join(parts), len(parts)
+
+
+def parse_bulk_response(response: Dict[str, Any], count: int) -> Tuple[int, int]:
+    """
+    统计 _bulk 响应结果
+    
+    Returns:
+        (成功数, 失败数)
+    """
+    if not response.get("errors"):
+        return count, 0
+    failed = sum(
+        1 for item in response.get("items", ())
+        for result in item.values() if "error" in result
+    )
+    return count - failed, failed
+
+
 class OpenSearchClient:
     """OpenSearch 客户端封装"""
     
     def __init__(self, config: Optional[OpenSearchConfig] = None):
         self.config = config or OpenSearchConfig()
         self._client: Optional[OpenSearch] = None
+        self._cache_key: Optional[tuple] = None
     
     @property
     def client(self) -> OpenSearch:
-        """懒加载获取客户端"""
+        """懒加载获取客户端（连接参数相同的实例共享）"""
         if self._client is None:
-            self._client = self._create_client()
+            with _CLIENT_CACHE_LOCK:
+                if self._client is None:
+                    self._client = self._acquire_client()
         return self._client
     
+    def _client_key(self) -> tuple:
+        """影响连接的配置项"""
+        c = self.config
+        return (
+            c.host, c.username, c.password, c.use_ssl, c.verify_certs,
+            c.pool_maxsize, c.http_compress, c.max_retries, c.retry_on_timeout,
+        )
+    
+    def _acquire_client(self) -> OpenSearch:
+        """从缓存取共享实例并增加引用计数，不存在时创建（调用方持有 _CLIENT_CACHE_LOCK）"""
+        key = self._client_key()
+        cached = _CLIENT_CACHE.get(key)
+        if cached is None:
+            cached = _CLIENT_CACHE[key] = [self._create_client(), 0]
+        cached[1] += 1
+        self._cache_key = key
+        return cached[0]
+    
     def _create_client(self) -> OpenSearch:
         """创建 OpenSearch 客户端"""
-        if not self.config.verify_certs:
-            warnings.filterwarnings("ignore", message=".*verify_certs.*")
-            warnings.filterwarnings("ignore", message=".*Unverified HTTPS.*")
-        
-        # 解析 host 和 url_prefix
-        client_params = {
-            "http_auth": (self.config.username, self.config.password),
-            "use_ssl": self.config.use_ssl,
-            "verify_certs": self.config.verify_certs,
-        }
-        
-        host = self.config.host
-        if "://" in host:
-            protocol, rest = host.split("://", 1)
-            if "/" in rest:
-                host_port, url_prefix = rest.split("/", 1)
-                client_params["hosts"] = [f"{protocol}://{host_port}"]
-                client_params["url_prefix"] = f"/{url_prefix}"
-            else:
-                client_params["hosts"] = [host]
-        else:
-            client_params["hosts"] = [host]
-        
-        return OpenSearch(**client_params)
+        return OpenSearch(
+            connection_class=Urllib3HttpConnection,
+            pool_maxsize=self.config.pool_maxsize,
+            **build_client_params(self.config),
+        )
     
     def ping(self) -> bool:
         """测试连接"""
@@ -122,33 +225,83 @@ class OpenSearchClient:
         except Exception:
             return False
     
-    def index_document(self, document: Dict[str, Any], index_name: Optional[str] = None) -> Dict[str, Any]:
-        """写入单个文档"""
+    def index_document(self, document: Union[Dict[str, Any], bytes], index_name: Optional[str] = None) -> Dict[str, Any]:
+        """写入单个文档（document 可以是已序列化的 JSON bytes）"""
         index_name = index_name or self.config.index_name
         try:
             return self.client.index(index=index_name, body=document)
         except Exception as e:
             return {"error": str(e)}
     
-    def bulk_index(self, documents: List[Dict[str, Any]], index_name: Optional[str] = None) -> Tuple[int, int]:
-        """批量写入文档"""
+    def _to_sources(self, documents: List[Union[Dict[str, Any], bytes]]) -> List[bytes]:
+        """将文档统一为 JSON bytes，已序列化的直接使用"""
+        dumps = self.client.transport.serializer.dumps
+        return [doc if isinstance(doc, bytes) else dumps(doc).encode() for doc in documents]
+    
+    def bulk_index(self, documents: List[Union[Dict[str, Any], bytes]], index_name: Optional[str] = None) -> Tuple[int, int]:
+        """
+        批量写入文档
+        
+        直接拼接 NDJSON 请求体调用底层 _bulk 接口，不经过 helpers.bulk 的逐条处理和二次序列化；
+        文档可以是 dict 或已序列化的 JSON bytes
+        """
         index_name = index_name or self.config.index_name
-        actions = [{"_index": index_name, "_source": doc} for doc in documents]
         
-        try:
-            success, failed = bulk(
-                self.client,
-                actions,
-                stats_only=True,
-                chunk_size=self.config.bulk_size,
-            )
-            return success, failed
-        except Exception:
-            return 0, len(documents)
+        total_success = 0
+        total_failed = 0
+        bodies = iter_bulk_bodies(self._to_sources(documents), self.config.bulk_size, self.config.bulk_max_bytes)
+        for body, count in bodies:
+            try:
+                success, failed = parse_bulk_response(self.client.bulk(body=body, index=index_name), count)
+            except Exception:
+                success, failed = 0, count
+            total_success += success
+            total_failed += failed
+        return total_success, total_failed
+    
+    def bulk_index_grouped(self, grouped: Dict[str, List[Union[Dict[str, Any], bytes]]]) -> Tuple[int, int]:
+        """
+        多个索引的文档合并为一个 _bulk 请求写入
+        
+        每个文档的动作行带上 _index（按索引缓存的 bytes），不再每个索引各发一次请求
+        
+        Args:
+            grouped: {索引名: 文档列表}
+        Returns:
+            (成功数, 失败数)
+        """
+        if len(grouped) == 1:
+            (index_name, documents), = grouped.items()
+            return self.bulk_index(documents, index_name=index_name)
+        
+        sources = [
+            (_action_line(index_name), source)
+            for index_name, documents in grouped.items()
+            for source in self._to_sources(documents)
+        ]
+        
+        total_success = 0
+        total_failed = 0
+        for body, count in iter_bulk_bodies(sources, self.config.bulk_size, self.config.bulk_max_bytes):
+            try:
+                success, failed = parse_bulk_response(self.client.bulk(body=body), count)
+            except Exception:
+                success, failed = 0, count
+            total_success += success
+            total_failed += failed
+        return total_success, total_failed
     
     def close(self) -> None:
-        """关闭连接"""
-        if self._client:
-            self._client.close()
+        """释放共享实例，最后一个使用者释放时才关闭连接"""
+        with _CLIENT_CACHE_LOCK:
+            if self._client is None:
+                return
+            cached = _CLIENT_CACHE.get(self._cache_key)
+            if cached is not None and cached[0] is self._client:
+                cached[1] -= 1
+                if cached[1] <= 0:
+                    del _CLIENT_CACHE[self._cache_key]
+                    self._client.close()
             self._client = None
+            self._cache_key = None
 
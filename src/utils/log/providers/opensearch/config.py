@@ -4,9 +4,10 @@ OpenSearch 配置模块
 定义 OpenSearch 连接配置和索引映射
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
 
 
 @dataclass
@@ -28,6 +29,30 @@ class OpenSearchConfig:
     
     # 写入配置
     bulk_size: int = 500
+    bulk_max_bytes: int = 5 * 1024 * 1024  # 单个 _bulk 请求体上限，超过时拆分
+    # 使用 AsyncOpenSearch 写入（需要 aiohttp），多索引批量写入并发进行
+    use_async: bool = False
+    
+    # 连接配置：连接池大小需覆盖并发写入数，避免溢出的请求每次重新 TLS 握手
+    pool_maxsize: int = 16
+    # gzip 压缩请求体：_bulk 的 NDJSON 中键名、服务名、时间戳大量重复，压缩后通常只有原来的 1/5~1/10
+    http_compress: bool = True
+    max_retries: int = 3
+    retry_on_timeout: bool = True
+    
+    # 由 host 解析得到（__post_init__ 中计算），修改 host 后需重新创建配置
+    _hosts: List[str] = field(init=False, repr=False, default_factory=list)
+    _url_prefix: Optional[str] = field(init=False, repr=False, default=None)
+    
+    def __post_init__(self):
+        """解析 host：带路径时（如 https://host/opensearch）拆分为节点地址和 url_prefix"""
+        if "://" not in self.host:
+            self._hosts = [self.host]
+            return
+        parts = urlsplit(self.host)
+        self._hosts = [f"{parts.scheme}://{parts.netloc}"]
+        prefix = parts.path.rstrip("/")
+        self._url_prefix = prefix or None
     
     @classmethod
     def from_env(cls) -> "OpenSearchConfig":
@@ -38,6 +63,7 @@ class OpenSearchConfig:
             password=os.getenv("OPENSEARCH_PASSWORD", cls.password),
             use_ssl=os.getenv("OPENSEARCH_USE_SSL", "true").lower() == "true",
             verify_certs=os.getenv("OPENSEARCH_VERIFY_CERTS", "true").lower() == "true",
+            http_compress=os.getenv("OPENSEARCH_HTTP_COMPRESS", "true").lower() == "true",
             index_name=os.getenv("OPENSEARCH_INDEX_NAME", cls.index_name),
         )
 
@@ -4,12 +4,21 @@ OpenSearch Provider 模块
 实现 BaseLogProvider 接口，提供 OpenSearch 日志写入功能
 """
 
+import asyncio
+import threading
+import time
+from collections import defaultdict
 from typing import Optional, List, Tuple
 
 from ..base import BaseLogProvider
 from ...models.models import LogEntry
 from .config import OpenSearchConfig
 from .client import OpenSearchClient
+from .async_client import AsyncOpenSearchClient
+
+
+# is_ready() 结果缓存时间（秒），避免健康检查每次都发起两次 HTTP 请求
+_READY_TTL = 5.0
 
 
 class OpenSearchProvider(BaseLogProvider):
@@ -30,44 +39,76 @@ class OpenSearchProvider(BaseLogProvider):
         """
         self.config = config or OpenSearchConfig()
         self._client = OpenSearchClient(self.config)
+        self._ready_cache: Tuple[float, bool] = (0.0, False)  # (检查时间, 结果)
+        
+        # use_async 时写入走 AsyncOpenSearch，协程在独立线程的事件循环中执行
+        self._async_client: Optional[AsyncOpenSearchClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        if self.config.use_async:
+            self._async_client = AsyncOpenSearchClient(self.config)
+    
+    def _run_async(self, coro):
+        """在 Provider 专用的事件循环线程中执行协程，阻塞等待结果"""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name=f"{self.name}-async", daemon=True
+                    ).start()
+                    self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
     
     def init(self, force: bool = False) -> bool:
-        """初始化索引"""
-        if not self._client.ping():
-            print(f"[{self.name}] 无法连接到 OpenSearch")
-            return False
-        return self._client.create_index(force=force)
+        """初始化索引（不单独 ping，连接失败由创建索引时的请求暴露）"""
+        try:
+            ok = self._client.create_index(force=force)
+        except Exception as e:
+            print(f"[{self.name}] 无法连接到 OpenSearch: {e}")
+            ok = False
+        self._ready_cache = (time.monotonic(), ok)
+        return ok
     
     def is_ready(self) -> bool:
-        """检查是否就绪"""
-        return self._client.ping() and self._client.index_exists()
+        """检查是否就绪（结果缓存 _READY_TTL 秒）"""
+        now = time.monotonic()
+        checked_at, ready = self._ready_cache
+        if now - checked_at < _READY_TTL:
+            return ready
+        try:
+            ready = self._client.ping() and self._client.index_exists()
+        except Exception:
+            ready = False
+        self._ready_cache = (now, ready)
+        return ready
     
     def write(self, entry: LogEntry) -> Optional[str]:
         """写入单条日志（支持指定 index）"""
         # 使用 entry.index 或默认配置的 index_name
         index_name = entry.index or self.config.index_name
-        result = self._client.index_document(entry.to_dict(), index_name=index_name)
+        # 传入已序列化的 bytes，opensearch-py 的序列化器会原样发送
+        document = entry.to_json()
+        if self._async_client is not None:
+            result = self._run_async(self._async_client.index_document(document, index_name=index_name))
+        else:
+            result = self._client.index_document(document, index_name=index_name)
         return result.get("_id")
     
     def bulk_write(self, entries: List[LogEntry]) -> Tuple[int, int]:
         """批量写入日志（按 index 分组写入）"""
         # 按 index 分组
-        grouped: dict[str, list] = {}
+        default_index = self.config.index_name
+        grouped: dict[str, list] = defaultdict(list)
         for entry in entries:
-            index_name = entry.index or self.config.index_name
-            if index_name not in grouped:
-                grouped[index_name] = []
-            grouped[index_name].append(entry.to_dict())
+            grouped[entry.index or default_index].append(entry.to_json())
         
-        # 分组批量写入
-        total_success = 0
-        total_failed = 0
-        for index_name, documents in grouped.items():
-            success, failed = self._client.bulk_index(documents, index_name=index_name)
-            total_success += success
-            total_failed += failed
+        # 异步模式：各索引的批量写入并发进行
+        if self._async_client is not None:
+            return self._run_async(self._async_client.bulk_index_grouped(grouped))
         
-        return total_success, total_failed
+        # 各索引的文档合并为一个 _bulk 请求
+        return self._client.bulk_index_grouped(grouped)
     
     def init_index(self, index_name: str, force: bool = False) -> bool:
         """初始化指定索引（用于多索引场景）"""
@@ -76,6 +117,10 @@ class OpenSearchProvider(BaseLogProvider):
     def close(self) -> None:
         """关闭连接"""
         self._client.close()
+        if self._loop is not None:
+            self._run_async(self._async_client.close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
     
     def get_cluster_name(self) -> str:
         """获取集群名称（OpenSearch 特有方法）"""
@@ -4,6 +4,12 @@ LogService 模块
 统一的日志服务入口，整合多个日志 Provider
 """
 
+import asyncio
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional, List, Dict, Tuple, Union
 
 from ..configs.config import LogServiceConfig
@@ -12,6 +18,20 @@ from ..providers.base import BaseLogProvider
 from ..providers import OpenSearchProvider, OpenSearchConfig
 
 
+_random = random.random
+
+
+class _ThreadBuffer:
+    """单个写入线程的日志缓冲区，只有所属线程追加、后台写入线程取出"""
+    
+    __slots__ = ("buf", "dropped", "thread")
+    
+    def __init__(self):
+        self.buf: deque = deque()
+        self.dropped = 0  # 只由所属线程累加
+        self.thread = threading.current_thread()
+
+
 class LogService:
     """
     统一日志服务（单例模式）
@@ -28,23 +48,64 @@ class LogService:
         
         # 指定使用特定 Provider
         service.error("Error", providers=["opensearch"])
+    
+    默认异步写入：log() 只将日志追加到当前线程的缓冲区，由后台线程统一取走后调用
+    Provider 的 bulk_write；需要确认写入完成时调用 flush()。
     """
     
     _instance: Optional["LogService"] = None
     _initialized: bool = False
+    _instance_lock = threading.Lock()  # 保证并发首次创建时只初始化一次（只启动一个后台线程）
     
     def __new__(cls, config: Optional[LogServiceConfig] = None):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+            return cls._instance
     
     def __init__(self, config: Optional[LogServiceConfig] = None):
         if LogService._initialized:
             return
-        
+        with LogService._instance_lock:
+            if not LogService._initialized:
+                self._setup(config)
+                LogService._initialized = True
+    
+    def _setup(self, config: Optional[LogServiceConfig]) -> None:
+        """初始化单例状态并启动后台写入线程"""
         self.config = config or LogServiceConfig()
         self._providers: Dict[str, BaseLogProvider] = {}
-        LogService._initialized = True
+        
+        # 异步写入缓冲区：每个写入线程一个 deque，元素为 (日志条目, 指定的 Provider 名称元组)
+        # 所属线程 append、后台线程 popleft，两者在 GIL 下都是原子操作，写入方之间互不争锁
+        self._local = threading.local()
+        # 所有线程缓冲区合计的待写入条数，与 queue_capacity 比较实现全局容量上限
+        # 写入方不加锁累加，只是近似值；后台线程每轮取走日志后按实际长度校正
+        self._queued = 0
+        self._thread_buffers: List[_ThreadBuffer] = []
+        self._buffers_lock = threading.Lock()    # 只在注册新线程和后台线程取列表时使用
+        self._not_full = threading.Condition()   # block 策略下等待缓冲区腾空
+        self._buf_event = threading.Event()      # 唤醒后台线程
+        # 缓冲区达到该长度时立即唤醒后台线程，否则等到 flush_interval_ms
+        self._wake_size = max(1, self.config.bulk_size) if self.config.auto_batch else 1
+        # 后台线程的写入轮次，flush() 等待一轮在调用之后开始的写入完成
+        self._rounds_started = 0
+        self._rounds_done = 0
+        self._round_cond = threading.Condition()
+        self._stopping = False
+        self._writer_exited = False  # 后台线程已完成最后一轮写入，之后不再有新的轮次
+        self._worker: Optional[threading.Thread] = None
+        self._dropped = 0
+        self._executor: Optional[ThreadPoolExecutor] = None  # alog 等协程方法使用，首次需要时创建
+        self._executor_lock = threading.Lock()
+        if self.config.async_write:
+            self._worker = threading.Thread(
+                target=self._drain, name="log-service-writer", daemon=True
+            )
+            self._worker.start()
     
     @classmethod
     def get_instance(cls, config: Optional[LogServiceConfig] = None) -> "LogService":
@@ -85,6 +146,7 @@ class LogService:
             是否成功
         """
         if name in self._providers:
+            self.flush()  # 先写完队列中的日志再关闭
             self._providers[name].close()
             del self._providers[name]
             return True
@@ -135,6 +197,7 @@ class LogService:
     def log(
         self,
         message: str,
+        *args,
         level: LogLevel = LogLevel.LOG,
         service: str = "default",
         providers: Optional[List[str]] = None,
@@ -144,7 +207,8 @@ class LogService:
         写入单条日志
         
         Args:
-            message: 日志消息
+            message: 日志消息，可以是 % 格式模板
+            *args: 模板参数，延迟到写入时才格式化（被采样丢弃的日志不做格式化）
             level: 日志级别
             service: 服务类别
             providers: 指定使用哪些 Provider，为 None 时使用默认配置
@@ -156,9 +220,18 @@ class LogService:
                 - metadata: 扩展元数据
                 - index: 目标索引（用于 OpenSearch，不指定则使用默认索引）
         Returns:
-            各 Provider 的写入结果（文档 ID 或 None）
+            各 Provider 的写入结果（文档 ID 或 None）；异步写入或被采样丢弃时返回空字典
         """
-        entry = LogEntry(message=message, level=level, service=service, **kwargs)
+        rate = self.config.sample_rates.get(level, 1.0)
+        if rate < 1.0 and _random() >= rate:
+            return {}
+        
+        entry = LogEntry(message=message, level=level, service=service, args=args, **kwargs)
+        
+        if self._worker is not None:
+            self._enqueue(entry, tuple(providers) if providers else None)
+            return {}
+        
         targets = self._get_target_providers(providers)
         
         results = {}
@@ -173,17 +246,64 @@ class LogService:
         
         return results
     
-    def info(self, message: str, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
+    def info(self, message: str, *args, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
         """写入普通日志"""
-        return self.log(message, LogLevel.LOG, service, **kwargs)
+        return self.log(message, *args, level=LogLevel.LOG, service=service, **kwargs)
     
-    def warn(self, message: str, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
+    def warn(self, message: str, *args, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
         """写入警告日志"""
-        return self.log(message, LogLevel.WARN, service, **kwargs)
+        return self.log(message, *args, level=LogLevel.WARN, service=service, **kwargs)
     
-    def error(self, message: str, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
+    def error(self, message: str, *args, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
         """写入错误日志"""
-        return self.log(message, LogLevel.ERROR, service, **kwargs)
+        return self.log(message, *args, level=LogLevel.ERROR, service=service, **kwargs)
+    
+    # ==================== 协程写入 ====================
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取写入线程池（懒加载）"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(1, self.config.executor_workers),
+                        thread_name_prefix="log-io",
+                    )
+        return self._executor
+    
+    async def alog(
+        self,
+        message: str,
+        *args,
+        level: LogLevel = LogLevel.LOG,
+        service: str = "default",
+        **kwargs
+    ) -> Dict[str, Optional[str]]:
+        """
+        在协程中写入单条日志，参数同 log()
+        
+        异步写入模式下 log() 只是入队，直接调用；
+        同步写入模式下 Provider 调用会阻塞，放到线程池执行，避免阻塞事件循环
+        """
+        if self._worker is not None:
+            return self.log(message, *args, level=level, service=service, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            partial(self.log, message, *args, level=level, service=service, **kwargs),
+        )
+    
+    async def ainfo(self, message: str, *args, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
+        """在协程中写入普通日志"""
+        return await self.alog(message, *args, level=LogLevel.LOG, service=service, **kwargs)
+    
+    async def awarn(self, message: str, *args, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
+        """在协程中写入警告日志"""
+        return await self.alog(message, *args, level=LogLevel.WARN, service=service, **kwargs)
+    
+    async def aerror(self, message: str, *args, service: str = "default", **kwargs) -> Dict[str, Optional[str]]:
+        """在协程中写入错误日志"""
+        return await self.alog(message, *args, level=LogLevel.ERROR, service=service, **kwargs)
     
     def bulk_log(
         self,
@@ -213,10 +333,171 @@ class LogService:
         
         return results
     
+    # ==================== 后台写入 ====================
+    
+    def _register_thread_buffer(self) -> _ThreadBuffer:
+        """为当前线程创建缓冲区并登记，每个线程只执行一次"""
+        tb = _ThreadBuffer()
+        with self._buffers_lock:
+            self._thread_buffers.append(tb)
+        self._local.buffer = tb
+        return tb
+    
+    def _enqueue(self, entry: LogEntry, providers: Optional[Tuple[str, ...]]) -> None:
+        """
+        将日志追加到当前线程的缓冲区
+        
+        所有线程合计的待写入条数达到 queue_capacity 时按 overflow_policy 处理：
+        drop_oldest 丢弃当前线程缓冲区中最早的一条（当前线程没有待写入的日志时丢弃新日志）。
+        """
+        try:
+            tb = self._local.buffer
+        except AttributeError:
+            tb = self._register_thread_buffer()
+        buf = tb.buf
+        
+        capacity = self.config.queue_capacity
+        if self._queued >= capacity:
+            policy = self.config.overflow_policy
+            if policy == "drop_newest":
+                tb.dropped += 1
+                return
+            if policy == "drop_oldest":
+                tb.dropped += 1
+                try:
+                    buf.popleft()
+                except IndexError:
+                    # 当前线程的日志已被后台线程取走，新日志即为最早的一条
+                    return
+                buf.append((entry, providers))
+                return
+            with self._not_full:
+                self._buf_event.set()
+                while self._queued >= capacity and not self._stopping:
+                    self._not_full.wait()
+        
+        buf.append((entry, providers))
+        self._queued += 1
+        if len(buf) >= self._wake_size and not self._buf_event.is_set():
+            self._buf_event.set()
+    
+    def _drain(self) -> None:
+        """
+        后台写入线程
+        
+        缓冲区攒够 bulk_size 条或每隔 flush_interval_ms 被唤醒一次，
+        依次取走各线程缓冲区中的日志，按 bulk_size 分批写入；
+        auto_batch 关闭时有日志即唤醒。停止时写完剩余日志后退出。
+        """
+        interval = self.config.flush_interval_ms / 1000 if self.config.auto_batch else None
+        bulk_size = max(1, self.config.bulk_size)
+        while True:
+            if not self._stopping:
+                self._buf_event.wait(interval)
+            self._buf_event.clear()
+            
+            with self._round_cond:
+                self._rounds_started += 1
+                stopping = self._stopping
+            
+            with self._buffers_lock:
+                buffers = list(self._thread_buffers)
+            
+            # 只取走当前已有的条数，所属线程可同时继续追加
+            items = []
+            for tb in buffers:
+                popleft = tb.buf.popleft
+                items.extend(popleft() for _ in range(len(tb.buf)))
+            
+            self._queued = sum(len(tb.buf) for tb in buffers)
+            with self._not_full:
+                self._not_full.notify_all()
+            self._prune_thread_buffers()
+            
+            for i in range(0, len(items), bulk_size):
+                try:
+                    self._write_batch(items[i:i + bulk_size])
+                except Exception as e:
+                    print(f"[LogService] 后台写入失败: {e}")
+            
+            with self._round_cond:
+                self._rounds_done += 1
+                if stopping and not items:
+                    self._writer_exited = True
+                self._round_cond.notify_all()
+            
+            if self._writer_exited:
+                break
+    
+    def _prune_thread_buffers(self) -> None:
+        """移除已退出且缓冲区已空的线程，其丢弃计数并入总数"""
+        with self._buffers_lock:
+            alive = []
+            for tb in self._thread_buffers:
+                if tb.buf or tb.thread.is_alive():
+                    alive.append(tb)
+                else:
+                    self._dropped += tb.dropped
+            self._thread_buffers = alive
+    
+    def _write_batch(self, batch: List[Tuple[LogEntry, Optional[Tuple[str, ...]]]]) -> None:
+        """按指定的 Provider 分组后批量写入"""
+        grouped: Dict[Optional[Tuple[str, ...]], List[LogEntry]] = {}
+        for entry, providers in batch:
+            grouped.setdefault(providers, []).append(entry)
+        for providers, entries in grouped.items():
+            self.bulk_log(entries, list(providers) if providers else None)
+    
+    def flush(self) -> None:
+        """
+        等待调用前已入队的日志全部写入 Provider
+        
+        在后台写入线程中调用（如 Provider 在 bulk_write 中注销自身）时直接返回；
+        与 close() 并发时，后台线程写完剩余日志退出后返回。
+        """
+        worker = self._worker
+        if worker is None or threading.current_thread() is worker:
+            return
+        with self._round_cond:
+            target = self._rounds_started + 1  # 在此之后开始的一轮会取走调用前入队的全部日志
+        self._buf_event.set()  # 不再等待凑批
+        with self._round_cond:
+            self._round_cond.wait_for(
+                lambda: self._rounds_done >= target or self._writer_exited
+            )
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        异步写入统计
+        
+        Returns:
+            {"queued": 所有线程缓冲区合计的待写入条数（上限约为 queue_capacity）,
+             "dropped": 缓冲区满时累计丢弃条数}
+        """
+        with self._buffers_lock:
+            buffers = list(self._thread_buffers)
+            dropped = self._dropped
+        return {
+            "queued": sum(len(tb.buf) for tb in buffers),
+            "dropped": dropped + sum(tb.dropped for tb in buffers),
+        }
+    
     # ==================== 生命周期 ====================
     
     def close(self) -> None:
-        """关闭所有 Provider"""
+        """停止后台写入线程（先写完队列中的日志），然后关闭所有 Provider"""
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            with self._not_full:
+                self._stopping = True
+                self._not_full.notify_all()
+            self._buf_event.set()
+            worker.join()
+        
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        
         for provider in self._providers.values():
             provider.close()
         self._providers.clear()
@@ -230,6 +511,9 @@ class LogService:
 
 def get_log_service(config: Optional[LogServiceConfig] = None) -> LogService:
     """获取日志服务单例"""
+    # 已创建时直接返回，不再经过 __new__/__init__ 的检查
+    if LogService._initialized:
+        return LogService._instance
     return LogService.get_instance(config)
 
 